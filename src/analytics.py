@@ -7,8 +7,28 @@ import json
 from datetime import datetime, timedelta
 from pathlib import Path
 
+import numpy as np
+
+from .constants import ANALYTICS_RETENTION_DAYS
 from .logger import logger
 from .signal_tracker import SignalTracker
+from .timeparse import parse_iso
+
+
+def _within(rows: list[dict], cutoff: datetime) -> np.ndarray:
+    """Boolean mask of rows whose ISO timestamp is after cutoff"""
+    if not rows:
+        return np.zeros(0, dtype=bool)
+    stamps = np.array([r["timestamp"] for r in rows], dtype="datetime64[us]")
+    return stamps > np.datetime64(cutoff)
+
+
+def _masked_mean(rows: list[dict], field: str, mask: np.ndarray) -> float:
+    """Mean of field over the rows selected by mask (0 when none are)"""
+    if not mask.any():
+        return 0
+    values = np.fromiter((r[field] for r in rows), dtype=float, count=len(rows))
+    return float(values[mask].mean())
 
 
 class Analytics:
@@ -37,46 +57,65 @@ class Analytics:
     def _save_data(self):
         """Save analytics data to file"""
         try:
-            with open(self.data_file, "w") as f:
-                json.dump(self.data, f, indent=2)
+            # Compact JSON to a temp file, then atomic replace so a crash never leaves a truncated file
+            temp_file = self.data_file.with_suffix(".json.tmp")
+            with open(temp_file, "w") as f:
+                json.dump(self.data, f, separators=(",", ":"))
+            temp_file.replace(self.data_file)
         except Exception as e:
             logger.error("analytics_save_failed", error=str(e))
 
+    def _append(self, stream: str, record: dict, now: datetime):
+        """Append a record, drop ones past the retention window, and save"""
+        rows = self.data[stream]
+        rows.append(record)
+
+        # Records arrive in time order, so only filter once the oldest one has aged out
+        cutoff = now - timedelta(days=ANALYTICS_RETENTION_DAYS)
+        if parse_iso(rows[0]["timestamp"]) <= cutoff:
+            self.data[stream] = [r for r, keep in zip(rows, _within(rows, cutoff), strict=True) if keep]
+
+        self._save_data()
+
     def record_market_scan(self, found: int, added: int, updated: int):
         """Record market scanner run statistics"""
-        self.data["market_scans"].append(
-            {"timestamp": datetime.now().isoformat(), "found": found, "added": added, "updated": updated}
+        now = datetime.now()
+        self._append(
+            "market_scans", {"timestamp": now.isoformat(), "found": found, "added": added, "updated": updated}, now
         )
-        self._save_data()
 
     def record_stage1_scan(self, checked: int, passed: int):
         """Record Stage 1 (Stoch RSI + MFI) scan statistics"""
-        self.data["stage1_scans"].append(
+        now = datetime.now()
+        self._append(
+            "stage1_scans",
             {
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": now.isoformat(),
                 "checked": checked,
                 "passed": passed,
                 "pass_rate": (passed / checked * 100) if checked > 0 else 0,
-            }
+            },
+            now,
         )
-        self._save_data()
 
     def record_stage2_scan(self, checked: int, confirmed: int):
         """Record Stage 2 (WaveTrend) scan statistics"""
-        self.data["stage2_scans"].append(
+        now = datetime.now()
+        self._append(
+            "stage2_scans",
             {
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": now.isoformat(),
                 "checked": checked,
                 "confirmed": confirmed,
                 "confirmation_rate": (confirmed / checked * 100) if checked > 0 else 0,
-            }
+            },
+            now,
         )
-        self._save_data()
 
     def record_alert_sent(self, symbol: str, price: float):
         """Record Telegram alert sent"""
-        self.data["alerts_sent"].append({"timestamp": datetime.now().isoformat(), "symbol": symbol, "price": price})
-        self._save_data()
+        now = datetime.now()
+        self._append("alerts_sent", {"timestamp": now.isoformat(), "symbol": symbol, "price": price}, now)
 
     def get_weekly_stats(self) -> dict:
         """
@@ -87,22 +126,21 @@ class Analytics:
         """
         cutoff = datetime.now() - timedelta(days=7)
 
-        # Filter data for past 7 days
-        market_scans = [s for s in self.data["market_scans"] if datetime.fromisoformat(s["timestamp"]) > cutoff]
-        stage1_scans = [s for s in self.data["stage1_scans"] if datetime.fromisoformat(s["timestamp"]) > cutoff]
-        stage2_scans = [s for s in self.data["stage2_scans"] if datetime.fromisoformat(s["timestamp"]) > cutoff]
-        alerts = [a for a in self.data["alerts_sent"] if datetime.fromisoformat(a["timestamp"]) > cutoff]
+        # One vectorized timestamp comparison per stream instead of parsing row by row
+        market_mask = _within(self.data["market_scans"], cutoff)
+        stage1_mask = _within(self.data["stage1_scans"], cutoff)
+        stage2_mask = _within(self.data["stage2_scans"], cutoff)
+        alerts_mask = _within(self.data["alerts_sent"], cutoff)
 
         # Calculate aggregates
-        total_market_scans = len(market_scans)
-        total_stage1_scans = len(stage1_scans)
-        total_stage2_scans = len(stage2_scans)
-        total_alerts = len(alerts)
-
-        avg_stage1_pass_rate = sum(s["pass_rate"] for s in stage1_scans) / len(stage1_scans) if stage1_scans else 0
-        avg_stage2_confirm_rate = (
-            sum(s["confirmation_rate"] for s in stage2_scans) / len(stage2_scans) if stage2_scans else 0
-        )
+        total_market_scans = int(market_mask.sum())
+        total_stage1_scans = int(stage1_mask.sum())
+        total_stage2_scans = int(stage2_mask.sum())
+        total_alerts = int(alerts_mask.sum())
+
+        avg_stage1_pass_rate = _masked_mean(self.data["stage1_scans"], "pass_rate", stage1_mask)
+        avg_stage2_confirm_rate = _masked_mean(self.data["stage2_scans"], "confirmation_rate", stage2_mask)
+        alert_symbols = {a["symbol"] for a, keep in zip(self.data["alerts_sent"], alerts_mask, strict=True) if keep}
 
         return {
             "period": "Last 7 days",
@@ -112,7 +150,7 @@ class Analytics:
             "alerts_sent": total_alerts,
             "avg_stage1_pass_rate": avg_stage1_pass_rate,
             "avg_stage2_confirm_rate": avg_stage2_confirm_rate,
-            "alert_symbols": list({a["symbol"] for a in alerts}),
+            "alert_symbols": list(alert_symbols),
         }
 
     def generate_weekly_report(self, signal_tracker: SignalTracker) -> str:
@@ -201,3 +239,15 @@ class Analytics:
         """Mark that weekly report was sent"""
         self.data["last_report_date"] = datetime.now().isoformat()
         self._save_data()
+
+
+# Global instance, reused across scan cycles so state is loaded from disk once
+_analytics: Analytics | None = None
+
+
+def get_analytics() -> Analytics:
+    """Get or create global analytics instance."""
+    global _analytics
+    if _analytics is None:
+        _analytics = Analytics()
+    return _analytics
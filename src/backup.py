@@ -269,3 +269,15 @@ class NotionBackup:
             "databases": databases,
             "backup_dir": str(self.backup_dir),
         }
+
+
+# Global instance, reused across scan cycles so state is loaded from disk once
+_backup: NotionBackup | None = None
+
+
+def get_backup() -> NotionBackup:
+    """Get or create global backup instance."""
+    global _backup
+    if _backup is None:
+        _backup = NotionBackup()
+    return _backup
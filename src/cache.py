@@ -5,13 +5,16 @@ Features:
 - Market cap caching (24 hours)
 - Automatic expiration
 - Persistence across restarts
+- Thread-safe (shared by concurrent market scan workers)
 """
 
 import json
-from datetime import datetime
+import threading
+import time
 from pathlib import Path
 
 from .logger import logger
+from .timeparse import parse_iso
 
 
 class MarketCapCache:
@@ -20,6 +23,7 @@ class MarketCapCache:
     def __init__(self, cache_file: str = "market_cap_cache.json", ttl_hours: int = 24):
         self.cache_file = Path(cache_file)
         self.ttl_hours = ttl_hours
+        self._lock = threading.RLock()
         self.cache = self._load_cache()
 
     def _load_cache(self) -> dict:
@@ -29,16 +33,27 @@ class MarketCapCache:
 
         try:
             with open(self.cache_file) as f:
-                return json.load(f)
+                cache = json.load(f)
         except Exception as e:
             logger.error("cache.load_failed", error=str(e))
             return {}
 
+        # Migrate legacy ISO-string timestamps to epoch seconds
+        for entry in cache.values():
+            if isinstance(entry.get("timestamp"), str):
+                entry["timestamp"] = parse_iso(entry["timestamp"]).timestamp()
+
+        return cache
+
     def _save_cache(self):
         """Save cache to disk"""
         try:
-            with open(self.cache_file, "w") as f:
-                json.dump(self.cache, f, indent=2)
+            # Write a temp file and swap it in so a crash never leaves a truncated cache behind
+            temp_file = self.cache_file.with_suffix(".json.tmp")
+            with self._lock:
+                with open(temp_file, "w") as f:
+                    json.dump(self.cache, f, separators=(",", ":"))
+                temp_file.replace(self.cache_file)
         except Exception as e:
             logger.error("cache.save_failed", error=str(e))
 
@@ -52,18 +67,18 @@ class MarketCapCache:
         Returns:
             Market cap value or None if not cached or expired
         """
-        if symbol not in self.cache:
-            return None
+        with self._lock:
+            entry = self.cache.get(symbol)
+            if entry is None:
+                return None
 
-        entry = self.cache[symbol]
-        cached_time = datetime.fromisoformat(entry["timestamp"])
-        age_hours = (datetime.now() - cached_time).total_seconds() / 3600
+            age_hours = (time.time() - entry["timestamp"]) / 3600
 
-        if age_hours > self.ttl_hours:
-            logger.debug("cache.expired", symbol=symbol, age_hours=age_hours)
-            del self.cache[symbol]
-            self._save_cache()
-            return None
+            if age_hours > self.ttl_hours:
+                logger.debug("cache.expired", symbol=symbol, age_hours=age_hours)
+                del self.cache[symbol]
+                self._save_cache()
+                return None
 
         logger.debug("cache.hit", symbol=symbol, age_hours=round(age_hours, 1))
         return entry["market_cap"]
@@ -76,26 +91,41 @@ class MarketCapCache:
             symbol: Stock symbol
             market_cap: Market cap value in USD
         """
-        self.cache[symbol] = {"market_cap": market_cap, "timestamp": datetime.now().isoformat()}
-        self._save_cache()
+        with self._lock:
+            self.cache[symbol] = {"market_cap": market_cap, "timestamp": time.time()}
+            self._save_cache()
         logger.debug("cache.set", symbol=symbol, market_cap=market_cap)
 
+    def set_many(self, market_caps: dict[str, float]):
+        """
+        Cache market caps for several symbols with a single disk write.
+
+        Args:
+            market_caps: Mapping of symbol to market cap value in USD
+        """
+        if not market_caps:
+            return
+
+        timestamp = time.time()
+        with self._lock:
+            for symbol, market_cap in market_caps.items():
+                self.cache[symbol] = {"market_cap": market_cap, "timestamp": timestamp}
+            self._save_cache()
+        logger.debug("cache.set_many", count=len(market_caps))
+
     def clear_expired(self):
         """Remove all expired entries from cache"""
-        now = datetime.now()
-        expired = []
-
-        for symbol, entry in list(self.cache.items()):
-            cached_time = datetime.fromisoformat(entry["timestamp"])
-            age_hours = (now - cached_time).total_seconds() / 3600
+        cutoff = time.time() - self.ttl_hours * 3600
 
-            if age_hours > self.ttl_hours:
-                expired.append(symbol)
-                del self.cache[symbol]
+        with self._lock:
+            # Single pass: keep fresh entries rather than copying items and deleting one by one
+            fresh = {symbol: entry for symbol, entry in self.cache.items() if entry["timestamp"] >= cutoff}
+            expired_count = len(self.cache) - len(fresh)
 
-        if expired:
-            self._save_cache()
-            logger.info("cache.expired_cleared", count=len(expired))
+            if expired_count:
+                self.cache = fresh
+                self._save_cache()
+                logger.info("cache.expired_cleared", count=expired_count)
 
     def get_stats(self) -> dict:
         """Get cache statistics"""
@@ -108,13 +138,12 @@ class MarketCapCache:
                 "newest_entry_hours": None,
             }
 
-        now = datetime.now()
+        now_ts = time.time()
         ages = []
         expired_count = 0
 
         for entry in self.cache.values():
-            cached_time = datetime.fromisoformat(entry["timestamp"])
-            age_hours = (now - cached_time).total_seconds() / 3600
+            age_hours = (now_ts - entry["timestamp"]) / 3600
             ages.append(age_hours)
 
             if age_hours > self.ttl_hours:
@@ -129,3 +158,15 @@ class MarketCapCache:
             "cache_file": str(self.cache_file),
             "ttl_hours": self.ttl_hours,
         }
+
+
+# Global instance, reused across scan cycles so state is loaded from disk once
+_market_cap_cache: MarketCapCache | None = None
+
+
+def get_market_cap_cache() -> MarketCapCache:
+    """Get or create global market cap cache instance."""
+    global _market_cap_cache
+    if _market_cap_cache is None:
+        _market_cap_cache = MarketCapCache()
+    return _market_cap_cache
@@ -9,6 +9,9 @@ from .exceptions import ConfigError
 
 load_dotenv()
 
+# libyaml's C loader parses several times faster; fall back when PyYAML lacks it
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 class TelegramConfig(BaseModel):
     bot_token: str = Field(..., min_length=10, description="Telegram bot token")
@@ -91,7 +94,7 @@ class Config(BaseModel):
             raise ConfigError(f"Config file not found: {path}")
 
         try:
-            raw = yaml.safe_load(p.read_text()) or {}
+            raw = yaml.load(p.read_text(), Loader=_YamlLoader) or {}
         except Exception as e:
             raise ConfigError(f"Failed to parse YAML: {e}") from e
 
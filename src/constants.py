@@ -14,6 +14,11 @@ MAX_RETRY_ATTEMPTS = 3  # Maximum retry attempts
 CONNECTION_POOL_SIZE = 10  # HTTP connection pool size
 YFINANCE_BATCH_SIZE = 50  # Symbols per batch for yfinance
 BATCH_SLEEP_SECONDS = 1.0  # Sleep between batches (seconds)
+SCAN_MAX_WORKERS = 10  # Worker threads for concurrent market scan
+NOTION_WRITE_WORKERS = 4  # Worker threads for flushing queued Notion writes
+OHLC_CACHE_TTL_SECONDS = 600  # Reuse fetched OHLC data for 10 minutes
+OHLC_CACHE_SIZE = 2000  # Max cached OHLC frames (daily + 4h for the S&P 500, with headroom)
+EXCHANGE_TIMEZONE = "America/New_York"  # S&P 500 session tz; 4h bars are binned in it
 
 
 # =============================================================================
@@ -67,7 +72,9 @@ MFI_UPTREND_DAYS = 3  # Days to check MFI uptrend
 SIGNAL_MAX_AGE_DAYS = 7  # Max age for signals before cleanup
 ALERT_COOLDOWN_DAYS = 7  # Days between same symbol alerts
 PERFORMANCE_LOOKBACK_DAYS = 7  # Days to evaluate signal performance
+PERFORMANCE_MAX_SIGNAL_AGE_DAYS = 60  # Pending signals older than this are given up on
 BACKUP_RETENTION_DAYS = 30  # Days to keep backup files
+ANALYTICS_RETENTION_DAYS = 31  # Days of analytics records to keep (weekly report reads 7)
 
 
 # =============================================================================
@@ -81,6 +88,7 @@ DAILY_ALERT_LIMIT = 5  # Max alerts per day to prevent fatigue
 # =============================================================================
 MIN_DATA_POINTS = 30  # Minimum data points required for analysis
 WEEKLY_DATA_WEEKS = 52  # Weeks of weekly data to fetch
+INDICATOR_CACHE_SIZE = 2000  # Memoized indicator results kept per process
 
 
 # =============================================================================
@@ -3,14 +3,100 @@ Yahoo Finance data source using yfinance library
 Free, unlimited, no API key required!
 """
 
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future
 from datetime import datetime, timedelta
 
 import pandas as pd
 import yfinance as yf
+from yfinance.data import YfData
 
+from .constants import EXCHANGE_TIMEZONE, OHLC_CACHE_SIZE, OHLC_CACHE_TTL_SECONDS, YFINANCE_BATCH_SIZE
 from .logger import logger
 from .rate_limiter import rate_limit
 
+# Yahoo multi-symbol quote endpoint (marketCap, regularMarketPrice, ...)
+QUOTE_URL = "https://query1.finance.yahoo.com/v7/finance/quote"
+
+# Short-lived in-memory cache of successful OHLC fetches: (interval, symbol, span) -> (fetched_at, df)
+# yfinance refuses requests_cache sessions, so repeated lookups within a scan are deduplicated here instead.
+# Kept in fetch order (oldest first) so expired and overflow entries are evicted from the front.
+_ohlc_cache: OrderedDict[tuple[str, str, int], tuple[float, pd.DataFrame]] = OrderedDict()
+# Fetches currently in progress; concurrent callers for the same key wait on the owner's Future
+_ohlc_inflight: dict[tuple[str, str, int], Future] = {}
+_ohlc_cache_lock = threading.Lock()
+
+
+def _get_cached_ohlc_locked(key: tuple[str, str, int]) -> pd.DataFrame | None:
+    """Return a cached OHLC frame younger than OHLC_CACHE_TTL_SECONDS (lock must be held)."""
+    entry = _ohlc_cache.get(key)
+    if entry is None:
+        return None
+    if time.monotonic() - entry[0] > OHLC_CACHE_TTL_SECONDS:
+        del _ohlc_cache[key]
+        return None
+    return entry[1]
+
+
+def _put_cached_ohlc(key: tuple[str, str, int], df: pd.DataFrame) -> None:
+    """Store a successfully fetched OHLC frame, evicting expired and overflow entries."""
+    now = time.monotonic()
+    with _ohlc_cache_lock:
+        _ohlc_cache[key] = (now, df)
+        _ohlc_cache.move_to_end(key)
+
+        # Keys with a changing span (e.g. days=max_days_since + 10) would otherwise pile up in a long-running process
+        while _ohlc_cache:
+            fetched_at = next(iter(_ohlc_cache.values()))[0]
+            if now - fetched_at <= OHLC_CACHE_TTL_SECONDS and len(_ohlc_cache) <= OHLC_CACHE_SIZE:
+                break
+            _ohlc_cache.popitem(last=False)
+
+
+def _cached_fetch(key: tuple[str, str, int], fetch: Callable[[], pd.DataFrame | None]) -> pd.DataFrame | None:
+    """
+    Serve an OHLC request from cache, an in-flight fetch, or a new fetch.
+
+    Only the first caller for a key hits Yahoo; callers arriving while that
+    fetch runs get the same result instead of issuing duplicate requests.
+    """
+    with _ohlc_cache_lock:
+        cached = _get_cached_ohlc_locked(key)
+        if cached is not None:
+            logger.debug("yfinance.cache_hit", interval=key[0], symbol=key[1])
+            return cached
+
+        future = _ohlc_inflight.get(key)
+        is_owner = future is None
+        if is_owner:
+            future = _ohlc_inflight[key] = Future()
+
+    if not is_owner:
+        logger.debug("yfinance.coalesced", interval=key[0], symbol=key[1])
+        return future.result()
+
+    try:
+        df = fetch()
+        if df is not None:
+            _put_cached_ohlc(key, df)
+        future.set_result(df)
+        return df
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _ohlc_cache_lock:
+            _ohlc_inflight.pop(key, None)
+
+
+def clear_ohlc_cache() -> None:
+    """Drop all cached OHLC frames."""
+    with _ohlc_cache_lock:
+        _ohlc_cache.clear()
+
 
 def daily_ohlc(symbol: str, days: int = 100) -> pd.DataFrame | None:
     """
@@ -24,6 +110,11 @@ def daily_ohlc(symbol: str, days: int = 100) -> pd.DataFrame | None:
         DataFrame with columns: Date, Open, High, Low, Close, Volume
         Returns None if data fetch fails or insufficient data
     """
+    return _cached_fetch(("1d", symbol, days), lambda: _fetch_daily_ohlc(symbol, days))
+
+
+def _fetch_daily_ohlc(symbol: str, days: int = 100) -> pd.DataFrame | None:
+    """Uncached daily_ohlc fetch."""
     try:
         # Rate limit yfinance calls
         rate_limit("yfinance")
@@ -43,9 +134,7 @@ def daily_ohlc(symbol: str, days: int = 100) -> pd.DataFrame | None:
             return None
 
         # Clean and prepare data
-        df = df.reset_index()
-        df = df[["Date", "Open", "High", "Low", "Close", "Volume"]]
-        df = df.dropna()
+        df = _clean_ohlc(df)
 
         # Keep only requested number of days
         df = df.tail(days)
@@ -62,6 +151,135 @@ def daily_ohlc(symbol: str, days: int = 100) -> pd.DataFrame | None:
         return None
 
 
+def _clean_ohlc(df: pd.DataFrame) -> pd.DataFrame:
+    """Flatten a yfinance frame to Date, Open, High, Low, Close, Volume rows without gaps."""
+    df = df.reset_index()
+    df = df.rename(columns={"Datetime": "Date"})
+    df = df[["Date", "Open", "High", "Low", "Close", "Volume"]]
+    return df.dropna()
+
+
+def _resample_4h(df: pd.DataFrame) -> pd.DataFrame:
+    """Aggregate 1h bars (DatetimeIndex) into cleaned 4h bars binned in exchange time."""
+    # yf.download may return UTC bars where Ticker.history returns exchange time; align so bin edges match
+    if df.index.tz is not None:
+        df = df.tz_convert(EXCHANGE_TIMEZONE)
+    df_4h = df.resample("4h").agg({"Open": "first", "High": "max", "Low": "min", "Close": "last", "Volume": "sum"})
+    return _clean_ohlc(df_4h.dropna())
+
+
+def _download_batches(
+    symbols: list[str], start_date: datetime, end_date: datetime, interval: str, batch_size: int
+) -> Iterator[tuple[str, pd.DataFrame]]:
+    """
+    Yield (symbol, raw frame) pairs from multi-ticker yf.download calls
+
+    Each batch is a single download (yfinance threads it internally).
+    Failed batches are logged and skipped; symbols Yahoo didn't return are omitted.
+    """
+    for start in range(0, len(symbols), batch_size):
+        batch = symbols[start : start + batch_size]
+        try:
+            rate_limit("yfinance")
+            logger.info("yfinance.batch_fetch", symbols=len(batch), interval=interval)
+
+            data = yf.download(
+                batch,
+                start=start_date,
+                end=end_date,
+                interval=interval,
+                group_by="ticker",
+                auto_adjust=True,
+                threads=True,
+                progress=False,
+            )
+        except Exception as e:
+            logger.error("yfinance.batch_error", symbols=len(batch), interval=interval, error=str(e))
+            continue
+
+        if data is None or data.empty:
+            continue
+
+        # Older yfinance returns flat OHLC columns for a single-ticker download, not a (ticker, field) MultiIndex
+        if not isinstance(data.columns, pd.MultiIndex):
+            if len(batch) == 1:
+                yield batch[0], data
+            else:
+                logger.warning("yfinance.batch_unexpected_columns", symbols=len(batch), interval=interval)
+            continue
+
+        available = set(data.columns.get_level_values(0))
+        for symbol in batch:
+            if symbol in available:
+                yield symbol, data[symbol]
+
+
+def batch_daily_ohlc(
+    symbols: list[str], days: int = 100, batch_size: int = YFINANCE_BATCH_SIZE
+) -> dict[str, pd.DataFrame]:
+    """
+    Fetch daily OHLC data for many symbols with yf.download
+
+    Frames are cleaned exactly like daily_ohlc and seed its cache.
+
+    Args:
+        symbols: Stock ticker symbols
+        days: Number of days of historical data
+        batch_size: Symbols per download
+
+    Returns:
+        Dict mapping symbol to DataFrame with columns: Date, Open, High, Low, Close, Volume.
+        Symbols with no or insufficient data are missing.
+    """
+    frames: dict[str, pd.DataFrame] = {}
+    if not symbols:
+        return frames
+
+    end_date = datetime.now()
+    start_date = end_date - timedelta(days=days + 30)  # Extra buffer
+
+    for symbol, raw in _download_batches(symbols, start_date, end_date, "1d", batch_size):
+        df = _clean_ohlc(raw).tail(days)
+        if len(df) >= 14:  # Minimum needed for RSI
+            frames[symbol] = df
+            _put_cached_ohlc(("1d", symbol, days), df)
+
+    logger.info("yfinance.batch_success", interval="1d", requested=len(symbols), received=len(frames))
+    return frames
+
+
+def batch_4h_ohlc(symbols: list[str], days: int = 30, batch_size: int = YFINANCE_BATCH_SIZE) -> dict[str, pd.DataFrame]:
+    """
+    Fetch 4-hour OHLC data for many symbols with yf.download
+
+    Downloads 1h bars and resamples them exactly like hourly_4h_ohlc
+    (in exchange time, whatever tz yf.download returns), seeding its cache.
+
+    Args:
+        symbols: Stock ticker symbols
+        days: Number of days of historical data (max 60 for intraday)
+        batch_size: Symbols per download
+
+    Returns:
+        Dict mapping symbol to DataFrame; symbols with no or insufficient data are missing.
+    """
+    frames: dict[str, pd.DataFrame] = {}
+    if not symbols:
+        return frames
+
+    end_date = datetime.now()
+    start_date = end_date - timedelta(days=min(days, 60))  # yfinance only allows 60 days for intraday data
+
+    for symbol, raw in _download_batches(symbols, start_date, end_date, "1h", batch_size):
+        df_4h = _resample_4h(raw)
+        if len(df_4h) >= 30:  # Minimum needed for WaveTrend
+            frames[symbol] = df_4h
+            _put_cached_ohlc(("4h", symbol, days), df_4h)
+
+    logger.info("yfinance.batch_success", interval="4h", requested=len(symbols), received=len(frames))
+    return frames
+
+
 def weekly_ohlc(symbol: str, weeks: int = 52) -> pd.DataFrame | None:
     """
     Fetch weekly OHLC data from Yahoo Finance
@@ -74,6 +292,11 @@ def weekly_ohlc(symbol: str, weeks: int = 52) -> pd.DataFrame | None:
         DataFrame with columns: Date, Open, High, Low, Close, Volume
         Returns None if data fetch fails or insufficient data
     """
+    return _cached_fetch(("1wk", symbol, weeks), lambda: _fetch_weekly_ohlc(symbol, weeks))
+
+
+def _fetch_weekly_ohlc(symbol: str, weeks: int = 52) -> pd.DataFrame | None:
+    """Uncached weekly_ohlc fetch."""
     try:
         # Rate limit yfinance calls
         rate_limit("yfinance")
@@ -93,9 +316,7 @@ def weekly_ohlc(symbol: str, weeks: int = 52) -> pd.DataFrame | None:
             return None
 
         # Clean and prepare data
-        df = df.reset_index()
-        df = df[["Date", "Open", "High", "Low", "Close", "Volume"]]
-        df = df.dropna()
+        df = _clean_ohlc(df)
 
         # Keep only requested number of weeks
         df = df.tail(weeks)
@@ -124,6 +345,11 @@ def hourly_4h_ohlc(symbol: str, days: int = 30) -> pd.DataFrame | None:
         DataFrame with columns: Date, Open, High, Low, Close, Volume
         Returns None if data fetch fails or insufficient data
     """
+    return _cached_fetch(("4h", symbol, days), lambda: _fetch_hourly_4h_ohlc(symbol, days))
+
+
+def _fetch_hourly_4h_ohlc(symbol: str, days: int = 30) -> pd.DataFrame | None:
+    """Uncached hourly_4h_ohlc fetch."""
     try:
         # Rate limit yfinance calls
         rate_limit("yfinance")
@@ -146,13 +372,7 @@ def hourly_4h_ohlc(symbol: str, days: int = 30) -> pd.DataFrame | None:
             return None
 
         # Resample 1h to 4h
-        df_4h = df.resample("4h").agg({"Open": "first", "High": "max", "Low": "min", "Close": "last", "Volume": "sum"})
-        df_4h = df_4h.dropna()
-
-        # Clean and prepare data
-        df_4h = df_4h.reset_index()
-        df_4h = df_4h.rename(columns={"Datetime": "Date"})
-        df_4h = df_4h[["Date", "Open", "High", "Low", "Close", "Volume"]]
+        df_4h = _resample_4h(df)
 
         if len(df_4h) < 30:  # Minimum needed for WaveTrend
             logger.warning("yfinance.insufficient_4h_data", symbol=symbol, rows=len(df_4h))
@@ -164,3 +384,40 @@ def hourly_4h_ohlc(symbol: str, days: int = 30) -> pd.DataFrame | None:
     except Exception as e:
         logger.error("yfinance.4h_error", symbol=symbol, error=str(e))
         return None
+
+
+def batch_quotes(symbols: list[str], batch_size: int = YFINANCE_BATCH_SIZE) -> dict[str, dict]:
+    """
+    Fetch quote data for many symbols with one Yahoo request per batch
+
+    Uses yfinance's shared YfData session, which handles Yahoo's cookie/crumb.
+
+    Args:
+        symbols: Stock ticker symbols
+        batch_size: Symbols per request
+
+    Returns:
+        Dict mapping symbol to its raw quote (e.g. 'marketCap', 'regularMarketPrice').
+        Symbols from failed batches are simply missing.
+    """
+    quotes: dict[str, dict] = {}
+    if not symbols:
+        return quotes
+
+    data = YfData()
+    for start in range(0, len(symbols), batch_size):
+        batch = symbols[start : start + batch_size]
+        try:
+            rate_limit("yfinance")
+            result = data.get_raw_json(QUOTE_URL, params={"symbols": ",".join(batch), "formatted": "false"})
+
+            for quote in result.get("quoteResponse", {}).get("result") or []:
+                symbol = quote.get("symbol")
+                if symbol:
+                    quotes[symbol] = quote
+
+        except Exception as e:
+            logger.warning("yfinance.batch_quote_failed", symbols=len(batch), error=str(e))
+
+    logger.info("yfinance.batch_quotes", requested=len(symbols), received=len(quotes))
+    return quotes
@@ -7,10 +7,11 @@ This module contains the filtering logic used in the two-stage screening process
 Extracted from main.py for better separation of concerns.
 """
 
+import pandas as pd
 import yfinance as yf
 
 from .cache import MarketCapCache
-from .data_source_yfinance import daily_ohlc, hourly_4h_ohlc, weekly_ohlc
+from .data_source_yfinance import batch_quotes, daily_ohlc, hourly_4h_ohlc, weekly_ohlc
 from .indicators import (
     bollinger_bands,
     mfi,
@@ -35,8 +36,37 @@ except ImportError:
 # =============================================================================
 
 
+def prefetch_market_caps(symbols: list[str], cache: MarketCapCache) -> int:
+    """
+    Warm the market cap cache for symbols that are not cached yet.
+
+    Fetches quotes in batches so check_market_filter can read market caps
+    from the cache instead of requesting ticker.info per symbol.
+
+    Args:
+        symbols: Stock ticker symbols
+        cache: MarketCapCache to populate
+
+    Returns:
+        Number of symbols cached
+    """
+    missing = [s for s in symbols if cache.get(s) is None]
+    if not missing:
+        return 0
+
+    quotes = batch_quotes(missing)
+    market_caps = {symbol: quote["marketCap"] for symbol, quote in quotes.items() if (quote.get("marketCap") or 0) > 0}
+    cache.set_many(market_caps)
+
+    logger.info("market_caps_prefetched", missing=len(missing), cached=len(market_caps))
+    return len(market_caps)
+
+
 def check_market_filter(
-    symbol: str, cache: MarketCapCache | None = None, alpha_vantage_key: str | None = None
+    symbol: str,
+    cache: MarketCapCache | None = None,
+    alpha_vantage_key: str | None = None,
+    df: pd.DataFrame | None = None,
 ) -> dict | None:
     """
     Check if symbol passes market scanner filters (Stage 1).
@@ -55,6 +85,7 @@ def check_market_filter(
         symbol: Stock ticker symbol
         cache: Optional MarketCapCache instance for performance
         alpha_vantage_key: Optional Alpha Vantage API key for precise indicators
+        df: Optional prefetched daily OHLC data (skips the per-symbol fetch)
 
     Returns:
         dict with 'passed' (bool) and indicator values, or None if data unavailable
@@ -69,8 +100,10 @@ def check_market_filter(
             "market_filter_check", symbol=symbol, using_alpha_vantage=bool(alpha_vantage_key and alpha_vantage_ohlc)
         )
 
-        # Get price data - use Alpha Vantage if available, else yfinance
-        if alpha_vantage_key and alpha_vantage_ohlc is not None:
+        # Get price data (unless prefetched) - use Alpha Vantage if available, else yfinance
+        if df is not None:
+            logger.debug("market_filter_prefetched_data", symbol=symbol, rows=len(df))
+        elif alpha_vantage_key and alpha_vantage_ohlc is not None:
             df = alpha_vantage_ohlc(symbol, alpha_vantage_key, days=100)
             if df is None:
                 # Fallback to yfinance
@@ -108,9 +141,9 @@ def check_market_filter(
             return {"passed": False, "reason": "market_cap_too_low"}
 
         # 2. Calculate Stochastic RSI (3,3,14,14)
-        stoch_ind = stochastic_rsi(df["Close"], rsi_period=14, stoch_period=14, k=3, d=3)
-        stoch_d = float(stoch_ind["d"].iloc[-1])
-        stoch_k = float(stoch_ind["k"].iloc[-1])
+        stoch_ind = stochastic_rsi(df["Close"], rsi_period=14, stoch_period=14, k=3, d=3, symbol=symbol)
+        stoch_d = float(stoch_ind["d"].iat[-1])
+        stoch_k = float(stoch_ind["k"].iat[-1])
 
         if stoch_d >= 20:
             logger.info("market_filter_stoch_not_oversold", symbol=symbol, stoch_d=stoch_d)
@@ -118,16 +151,16 @@ def check_market_filter(
 
         # 3. Check Bollinger Bands - Price < Lower Band
         bb = bollinger_bands(df["Close"], period=20, std_dev=2.0)
-        current_price = float(df["Close"].iloc[-1])
-        bb_lower = float(bb["lower"].iloc[-1])
+        current_price = float(df["Close"].iat[-1])
+        bb_lower = float(bb["lower"].iat[-1])
 
         if current_price >= bb_lower:
             logger.info("market_filter_price_not_below_bb", symbol=symbol, price=current_price, bb_lower=bb_lower)
             return {"passed": False, "reason": "price_not_below_bb", "price": current_price, "bb_lower": bb_lower}
 
         # 4. Check MFI <= 40
-        mfi_values = mfi(df, period=14)
-        mfi_current = float(mfi_values.iloc[-1])
+        mfi_values = mfi(df, period=14, symbol=symbol)
+        mfi_current = float(mfi_values.iat[-1])
 
         if mfi_current > 40:
             logger.info("market_filter_mfi_too_high", symbol=symbol, mfi=mfi_current)
@@ -182,8 +215,8 @@ def check_signal_criteria(symbol: str) -> dict | None:
             return None
 
         # Calculate indicators
-        stoch_ind = stochastic_rsi(df["Close"], rsi_period=14, stoch_period=14, k=3, d=3)
-        mfi_values = mfi(df, period=14)
+        stoch_ind = stochastic_rsi(df["Close"], rsi_period=14, stoch_period=14, k=3, d=3, symbol=symbol)
+        mfi_values = mfi(df, period=14, symbol=symbol)
 
         # Check Stochastic RSI bullish cross
         has_stoch_signal = stoch_rsi_buy(stoch_ind)
@@ -193,9 +226,9 @@ def check_signal_criteria(symbol: str) -> dict | None:
 
         if has_stoch_signal and mfi_trending_up:
             return {
-                "stoch_k": float(stoch_ind["k"].iloc[-1]),
-                "stoch_d": float(stoch_ind["d"].iloc[-1]),
-                "mfi": float(mfi_values.iloc[-1]),
+                "stoch_k": float(stoch_ind["k"].iat[-1]),
+                "stoch_d": float(stoch_ind["d"].iat[-1]),
+                "mfi": float(mfi_values.iat[-1]),
                 "mfi_uptrend": True,
             }
 
@@ -244,11 +277,11 @@ def check_wavetrend_signal(symbol: str, use_multi_timeframe: bool = True) -> boo
             if df_daily is None or len(df_daily) < 30:
                 logger.warning("insufficient_data", symbol=symbol)
                 return False
-            wt_signal = wavetrend(df_daily, channel_length=10, average_length=21)
+            wt_signal = wavetrend(df_daily, channel_length=10, average_length=21, symbol=symbol)
             timeframe_used = "daily"
         else:
             # Calculate 4-hour WaveTrend
-            wt_signal = wavetrend(df_4h, channel_length=10, average_length=21)
+            wt_signal = wavetrend(df_4h, channel_length=10, average_length=21, symbol=symbol)
             timeframe_used = "4h"
 
         # Check for WaveTrend buy signal (cross in oversold zone)
@@ -261,8 +294,8 @@ def check_wavetrend_signal(symbol: str, use_multi_timeframe: bool = True) -> boo
             "wavetrend_signal_detected",
             symbol=symbol,
             timeframe=timeframe_used,
-            wt1=float(wt_signal["wt1"].iloc[-1]),
-            wt2=float(wt_signal["wt2"].iloc[-1]),
+            wt1=float(wt_signal["wt1"].iat[-1]),
+            wt2=float(wt_signal["wt2"].iat[-1]),
         )
 
         # Multi-timeframe confirmation (optional)
@@ -270,8 +303,8 @@ def check_wavetrend_signal(symbol: str, use_multi_timeframe: bool = True) -> boo
             # Daily confirmation - should be oversold or neutral
             df_daily = daily_ohlc(symbol)
             if df_daily is not None and len(df_daily) >= 30:
-                wt_daily = wavetrend(df_daily, channel_length=10, average_length=21)
-                daily_wt1 = float(wt_daily["wt1"].iloc[-1])
+                wt_daily = wavetrend(df_daily, channel_length=10, average_length=21, symbol=symbol)
+                daily_wt1 = float(wt_daily["wt1"].iat[-1])
 
                 # Reject if daily is overbought (WT1 > 30)
                 if daily_wt1 > 30:
@@ -287,8 +320,8 @@ def check_wavetrend_signal(symbol: str, use_multi_timeframe: bool = True) -> boo
             df_weekly = weekly_ohlc(symbol, weeks=52)
 
             if df_weekly is not None and len(df_weekly) >= 14:
-                wt_weekly = wavetrend(df_weekly, channel_length=10, average_length=21)
-                weekly_wt1 = float(wt_weekly["wt1"].iloc[-1])
+                wt_weekly = wavetrend(df_weekly, channel_length=10, average_length=21, symbol=symbol)
+                weekly_wt1 = float(wt_weekly["wt1"].iat[-1])
 
                 # Reject if weekly is extremely overbought (prevents buying at tops)
                 if weekly_wt1 > 60:
@@ -304,7 +337,7 @@ def check_wavetrend_signal(symbol: str, use_multi_timeframe: bool = True) -> boo
                     "wavetrend_multi_timeframe_confirmed",
                     symbol=symbol,
                     signal_timeframe=timeframe_used,
-                    signal_wt1=float(wt_signal["wt1"].iloc[-1]),
+                    signal_wt1=float(wt_signal["wt1"].iat[-1]),
                     daily_wt1=daily_wt1 if df_daily is not None else None,
                     weekly_wt1=weekly_wt1,
                 )
@@ -315,8 +348,8 @@ def check_wavetrend_signal(symbol: str, use_multi_timeframe: bool = True) -> boo
             "wavetrend_signal_found",
             symbol=symbol,
             timeframe=timeframe_used,
-            wt1=float(wt_signal["wt1"].iloc[-1]),
-            wt2=float(wt_signal["wt2"].iloc[-1]),
+            wt1=float(wt_signal["wt1"].iat[-1]),
+            wt2=float(wt_signal["wt2"].iat[-1]),
         )
 
         return True
@@ -341,18 +374,18 @@ def get_wavetrend_values(symbol: str) -> dict | None:
         if df_daily is None or len(df_daily) < 30:
             return None
 
-        wt_daily = wavetrend(df_daily, channel_length=10, average_length=21)
+        wt_daily = wavetrend(df_daily, channel_length=10, average_length=21, symbol=symbol)
 
         result = {
-            "daily_wt1": float(wt_daily["wt1"].iloc[-1]),
-            "daily_wt2": float(wt_daily["wt2"].iloc[-1]),
+            "daily_wt1": float(wt_daily["wt1"].iat[-1]),
+            "daily_wt2": float(wt_daily["wt2"].iat[-1]),
         }
 
         # Try to get weekly data
         df_weekly = weekly_ohlc(symbol, weeks=52)
         if df_weekly is not None and len(df_weekly) >= 14:
-            wt_weekly = wavetrend(df_weekly, channel_length=10, average_length=21)
-            result["weekly_wt1"] = float(wt_weekly["wt1"].iloc[-1])
+            wt_weekly = wavetrend(df_weekly, channel_length=10, average_length=21, symbol=symbol)
+            result["weekly_wt1"] = float(wt_weekly["wt1"].iat[-1])
 
         return result
 
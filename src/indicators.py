@@ -1,6 +1,11 @@
+import threading
+from collections import OrderedDict
+from functools import wraps
+
 import pandas as pd
 
 from .constants import (
+    INDICATOR_CACHE_SIZE,
     MFI_PERIOD,
     MFI_UPTREND_DAYS,
     SIGNAL_LOOKBACK_DAYS,
@@ -12,6 +17,62 @@ from .constants import (
     WAVETREND_OVERSOLD,
 )
 
+# LRU of indicator results: (function, symbol, bar key, params) -> result
+_indicator_cache: OrderedDict[tuple, object] = OrderedDict()
+_indicator_cache_lock = threading.Lock()
+
+
+def _bar_key(data: pd.Series | pd.DataFrame) -> tuple:
+    """Fingerprint a price series by its length and first/last bars."""
+    if len(data) == 0:
+        return (0,)
+    if isinstance(data, pd.DataFrame):
+        first, last = tuple(data.iloc[0]), tuple(data.iloc[-1])
+    else:
+        first, last = data.iloc[0], data.iloc[-1]
+    return (len(data), data.index[0], data.index[-1], first, last)
+
+
+def memoize_by_last_bar(func):
+    """
+    Memoize an indicator per symbol until its price data changes
+
+    The wrapped function accepts an extra keyword-only ``symbol``; calls
+    without it are not cached. The key includes the last bar's values, so
+    an intraday update of today's candle still triggers a recompute.
+    """
+
+    @wraps(func)
+    def wrapper(data, *args, symbol: str | None = None, **kwargs):
+        if symbol is None:
+            return func(data, *args, **kwargs)
+
+        key = (func.__name__, symbol, _bar_key(data), args, tuple(sorted(kwargs.items())))
+        with _indicator_cache_lock:
+            if key in _indicator_cache:
+                _indicator_cache.move_to_end(key)
+                return _indicator_cache[key]
+
+        result = func(data, *args, **kwargs)
+
+        with _indicator_cache_lock:
+            _indicator_cache[key] = result
+            while len(_indicator_cache) > INDICATOR_CACHE_SIZE:
+                _indicator_cache.popitem(last=False)
+        return result
+
+    return wrapper
+
+
+def invalidate(symbol: str | None = None) -> None:
+    """Drop memoized indicator results for one symbol, or all when symbol is None."""
+    with _indicator_cache_lock:
+        if symbol is None:
+            _indicator_cache.clear()
+            return
+        for key in [k for k in _indicator_cache if k[1] == symbol]:
+            del _indicator_cache[key]
+
 
 def rsi(series: pd.Series, period: int = STOCH_RSI_PERIOD) -> pd.Series:
     """
@@ -30,6 +91,7 @@ def rsi(series: pd.Series, period: int = STOCH_RSI_PERIOD) -> pd.Series:
     return 100 - (100 / (1 + rs))
 
 
+@memoize_by_last_bar
 def mfi(df: pd.DataFrame, period: int = MFI_PERIOD) -> pd.Series:
     """
     Calculate MFI (Money Flow Index)
@@ -89,9 +151,9 @@ def mfi_uptrend(mfi_series: pd.Series, days: int = MFI_UPTREND_DAYS) -> bool:
     # P1 = today (most recent)
     # P2 = yesterday
     # P3 = 2 days ago
-    p1 = mfi_series.iloc[-1]  # today
-    p2 = mfi_series.iloc[-2]  # yesterday
-    p3 = mfi_series.iloc[-3]  # 2 days ago
+    p1 = mfi_series.iat[-1]  # today
+    p2 = mfi_series.iat[-2]  # yesterday
+    p3 = mfi_series.iat[-3]  # 2 days ago
 
     if pd.isna(p1) or pd.isna(p2) or pd.isna(p3):
         return False
@@ -109,6 +171,7 @@ def mfi_uptrend(mfi_series: pd.Series, days: int = MFI_UPTREND_DAYS) -> bool:
     return p1 > p2 and p1 > p3
 
 
+@memoize_by_last_bar
 def wavetrend(df: pd.DataFrame, channel_length: int = 10, average_length: int = 21) -> pd.DataFrame:
     """
     Calculate WaveTrend indicator by LazyBear
@@ -176,38 +239,27 @@ def wavetrend_buy(
     if len(wt_df) < min_required:
         return False
 
-    # Check last N days for bullish cross
-    for i in range(1, lookback_days + 1):
-        idx = -i
-        prev_idx = idx - 1
-
-        if abs(prev_idx) > len(wt_df):
-            break
-
-        prev = wt_df.iloc[prev_idx]
-        curr = wt_df.iloc[idx]
-
-        # NaN check
-        if pd.isna(prev.wt1) or pd.isna(prev.wt2) or pd.isna(curr.wt1) or pd.isna(curr.wt2):
-            continue
+    # Only the last lookback_days + 1 bars matter; work on raw arrays instead of per-row iloc
+    wt1 = wt_df["wt1"].to_numpy(dtype=float)[-(lookback_days + 1) :]
+    wt2 = wt_df["wt2"].to_numpy(dtype=float)[-(lookback_days + 1) :]
+    prev_wt1, prev_wt2, curr_wt1, curr_wt2 = wt1[:-1], wt2[:-1], wt1[1:], wt2[1:]
 
-        # Cross up: wt1 crosses above wt2
-        cross_up = prev.wt1 <= prev.wt2 and curr.wt1 > curr.wt2
+    # NaN comparisons are False, so bars with missing values never qualify
+    # Cross up: wt1 crosses above wt2
+    cross_up = (prev_wt1 <= prev_wt2) & (curr_wt1 > curr_wt2)
 
-        # Oversold: Either wave below oversold level
-        oversold = (
-            curr.wt1 < oversold_level
-            or curr.wt2 < oversold_level
-            or prev.wt1 < oversold_level
-            or prev.wt2 < oversold_level
-        )
+    # Oversold: Either wave below oversold level
+    oversold = (
+        (curr_wt1 < oversold_level)
+        | (curr_wt2 < oversold_level)
+        | (prev_wt1 < oversold_level)
+        | (prev_wt2 < oversold_level)
+    )
 
-        if cross_up and oversold:
-            return True
-
-    return False
+    return bool((cross_up & oversold).any())
 
 
+@memoize_by_last_bar
 def stochastic_rsi(
     close: pd.Series, rsi_period=STOCH_RSI_PERIOD, stoch_period=STOCH_PERIOD, k=STOCH_K_SMOOTH, d=STOCH_D_SMOOTH
 ) -> pd.DataFrame:
@@ -241,37 +293,22 @@ def stoch_rsi_buy(df: pd.DataFrame, lookback_days: int = SIGNAL_LOOKBACK_DAYS) -
     if len(df) < min_required:
         return False
 
-    # Check last N days for a bullish cross
-    for i in range(1, lookback_days + 1):
-        idx = -i
-        prev_idx = idx - 1
-
-        # Boundary check
-        if abs(prev_idx) > len(df):
-            break
-
-        prev = df.iloc[prev_idx]
-        curr = df.iloc[idx]
-
-        # NaN check
-        if any(pd.isna(v) for v in [prev.k, prev.d, curr.k, curr.d]):
-            continue
-
-        # Cross up: K crosses above D
-        cross_up = prev.k <= prev.d and curr.k > curr.d
-
-        # Oversold: Either line is below 20 during the cross
-        oversold = (
-            curr.k < STOCH_OVERSOLD or curr.d < STOCH_OVERSOLD or prev.k < STOCH_OVERSOLD or prev.d < STOCH_OVERSOLD
-        )
+    # Only the last lookback_days + 1 bars matter; work on raw arrays instead of per-row iloc
+    k = df["k"].to_numpy(dtype=float)[-(lookback_days + 1) :]
+    d = df["d"].to_numpy(dtype=float)[-(lookback_days + 1) :]
+    prev_k, prev_d, curr_k, curr_d = k[:-1], d[:-1], k[1:], d[1:]
 
-        # Valid signal requires: cross + oversold (simplified)
-        valid_cross = cross_up and oversold
+    # NaN comparisons are False, so bars with missing values never qualify
+    # Cross up: K crosses above D
+    cross_up = (prev_k <= prev_d) & (curr_k > curr_d)
 
-        if valid_cross:
-            return True
+    # Oversold: Either line is below 20 during the cross
+    oversold = (
+        (curr_k < STOCH_OVERSOLD) | (curr_d < STOCH_OVERSOLD) | (prev_k < STOCH_OVERSOLD) | (prev_d < STOCH_OVERSOLD)
+    )
 
-    return False
+    # Valid signal requires: cross + oversold (simplified)
+    return bool((cross_up & oversold).any())
 
 
 def bollinger_bands(data: pd.Series, period: int = 20, std_dev: float = 2.0) -> dict:
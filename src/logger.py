@@ -42,20 +42,30 @@ class StructuredLogger:
             return f"{msg} {kv_str}"
         return msg
 
+    def isEnabledFor(self, level: int) -> bool:
+        """Whether a record at this level would be emitted; use to skip building costly fields."""
+        return self._logger.isEnabledFor(level)
+
+    # Each level checks isEnabledFor first so filtered-out calls skip formatting the key-value string
     def debug(self, msg, **kwargs):
-        self._logger.debug(self._format_msg(msg, **kwargs))
+        if self._logger.isEnabledFor(logging.DEBUG):
+            self._logger.debug(self._format_msg(msg, **kwargs))
 
     def info(self, msg, **kwargs):
-        self._logger.info(self._format_msg(msg, **kwargs))
+        if self._logger.isEnabledFor(logging.INFO):
+            self._logger.info(self._format_msg(msg, **kwargs))
 
     def warning(self, msg, **kwargs):
-        self._logger.warning(self._format_msg(msg, **kwargs))
+        if self._logger.isEnabledFor(logging.WARNING):
+            self._logger.warning(self._format_msg(msg, **kwargs))
 
     def error(self, msg, **kwargs):
-        self._logger.error(self._format_msg(msg, **kwargs))
+        if self._logger.isEnabledFor(logging.ERROR):
+            self._logger.error(self._format_msg(msg, **kwargs))
 
     def exception(self, msg, **kwargs):
-        self._logger.exception(self._format_msg(msg, **kwargs))
+        if self._logger.isEnabledFor(logging.ERROR):
+            self._logger.exception(self._format_msg(msg, **kwargs))
 
 
 def setup_logger(level: str = "INFO", log_file: bool = True):
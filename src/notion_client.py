@@ -174,6 +174,14 @@ class NotionClient:
 
     # ==================== Common Operations ====================
 
+    def get_signals_set(self) -> set[str]:
+        """Get upper-cased symbols in the signals database."""
+        return self._repo.get_signals_set()
+
+    def get_buy_set(self) -> set[str]:
+        """Get upper-cased symbols in the buy database."""
+        return self._repo.get_buy_set()
+
     def get_all_symbols(self) -> set:
         """Get all unique symbols across signals and buy databases."""
         return self._repo.get_all_symbols()
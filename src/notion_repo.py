@@ -322,14 +322,7 @@ class NotionRepository:
         Returns:
             True if symbol exists, False otherwise
         """
-        if not self.signals_database_id:
-            return False
-
-        try:
-            symbols, _ = self.get_signals()
-            return symbol.upper() in [s.upper() for s in symbols]
-        except Exception:
-            return False
+        return symbol.upper() in self.get_signals_set()
 
     def remove_duplicates_from_signals(self) -> int:
         """
@@ -588,14 +581,7 @@ class NotionRepository:
         Returns:
             True if symbol exists, False otherwise
         """
-        if not self.buy_database_id:
-            return False
-
-        try:
-            buy_symbols = self._get_symbols_from_database(self.buy_database_id)
-            return symbol.upper() in [s.upper() for s in buy_symbols]
-        except Exception:
-            return False
+        return symbol.upper() in self.get_buy_set()
 
     def cleanup_old_buys(self, max_age_days: int = 15) -> int:
         """
@@ -672,6 +658,42 @@ class NotionRepository:
 
     # ==================== Common Operations ====================
 
+    def get_signals_set(self) -> set[str]:
+        """
+        Get upper-cased symbols in the signals database for local membership checks.
+
+        Fetch once per scan and test ``symbol.upper() in result`` instead of
+        calling symbol_exists_in_signals (one query each) per symbol.
+
+        Returns:
+            Set of upper-cased symbols (empty if unavailable)
+        """
+        if not self.signals_database_id:
+            return set()
+
+        try:
+            symbols, _ = self.get_signals()
+            return {s.upper() for s in symbols}
+        except Exception as e:
+            logger.warning("notion.get_signals_failed", error=str(e))
+            return set()
+
+    def get_buy_set(self) -> set[str]:
+        """
+        Get upper-cased symbols in the buy database for local membership checks.
+
+        Returns:
+            Set of upper-cased symbols (empty if unavailable)
+        """
+        if not self.buy_database_id:
+            return set()
+
+        try:
+            return {s.upper() for s in self._get_symbols_from_database(self.buy_database_id)}
+        except Exception as e:
+            logger.warning("notion.get_buy_failed", error=str(e))
+            return set()
+
     def get_all_symbols(self) -> set[str]:
         """
         Get all unique symbols across signals and buy databases.
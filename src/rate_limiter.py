@@ -5,7 +5,6 @@ Thread-safe, no external dependencies.
 
 import threading
 import time
-from collections import defaultdict
 
 from .constants import (
     ALPHA_VANTAGE_RATE_LIMIT,
@@ -34,15 +33,34 @@ class RateLimiter:
         "alpha_vantage": ALPHA_VANTAGE_RATE_LIMIT,
     }
 
+    # Bucket refill window: a service may burst up to its limit, then refills at limit/WINDOW per second
+    WINDOW = 60.0
+
     def __init__(self, custom_limits: dict | None = None):
         self._limits = {**self.DEFAULT_LIMITS, **(custom_limits or {})}
-        self._tokens = defaultdict(lambda: {"count": 0, "last_reset": time.time()})
-        self._lock = threading.Lock()
+        self._buckets: dict[str, dict] = {}
+        self._cond = threading.Condition()
+
+    def _refill(self, service: str, now: float) -> dict:
+        """Top up a service bucket for the time elapsed since its last refill (lock must be held)."""
+        limit = self._limits.get(service, 60)
+        bucket = self._buckets.get(service)
+        if bucket is None:
+            bucket = self._buckets[service] = {"tokens": float(limit), "last_refill": now}
+            return bucket
+
+        rate = limit / self.WINDOW
+        bucket["tokens"] = min(float(limit), bucket["tokens"] + (now - bucket["last_refill"]) * rate)
+        bucket["last_refill"] = now
+        return bucket
 
     def wait(self, service: str, cost: int = 1) -> float:
         """
         Wait if necessary to respect rate limit, then consume tokens.
 
+        Tokens refill continuously (limit / 60 per second), so a caller only
+        sleeps for as long as it takes to earn the missing tokens.
+
         Args:
             service: Service name (yfinance, notion, telegram, etc.)
             cost: Number of tokens to consume (default: 1)
@@ -51,68 +69,54 @@ class RateLimiter:
             Seconds waited (0 if no wait needed)
         """
         limit = self._limits.get(service, 60)
-        window = 60.0  # 1 minute window
-
-        with self._lock:
-            now = time.time()
-            bucket = self._tokens[service]
-
-            # Reset bucket if window passed
-            elapsed = now - bucket["last_reset"]
-            if elapsed >= window:
-                bucket["count"] = 0
-                bucket["last_reset"] = now
-
-            # Check if we need to wait
-            if bucket["count"] + cost > limit:
-                wait_time = window - elapsed
-                if wait_time > 0:
+        rate = limit / self.WINDOW
+        # A bucket never holds more than `limit` tokens, so larger costs wait for a full bucket
+        needed = min(cost, limit)
+
+        with self._cond:
+            start = time.monotonic()
+            logged = False
+
+            while True:
+                bucket = self._refill(service, time.monotonic())
+                if bucket["tokens"] >= needed:
+                    bucket["tokens"] -= cost
+                    return time.monotonic() - start if logged else 0.0
+
+                wait_time = (needed - bucket["tokens"]) / rate
+                if not logged:
                     logger.warning(
                         "rate_limit.waiting",
                         service=service,
                         wait_seconds=round(wait_time, 1),
-                        current_count=bucket["count"],
+                        current_count=limit - int(bucket["tokens"]),
                         limit=limit,
                     )
-                    # Release lock while sleeping
-                    self._lock.release()
-                    try:
-                        time.sleep(wait_time)
-                    finally:
-                        self._lock.acquire()
-
-                    # Reset after wait
-                    bucket["count"] = 0
-                    bucket["last_reset"] = time.time()
+                    logged = True
 
-                    bucket["count"] += cost
-                    return wait_time
-
-            bucket["count"] += cost
-            return 0.0
+                # Releases the lock while sleeping; state is re-read on wake-up
+                self._cond.wait(wait_time)
 
     def get_remaining(self, service: str) -> int:
-        """Get remaining requests for a service in current window."""
-        limit = self._limits.get(service, 60)
-        with self._lock:
-            bucket = self._tokens[service]
-            elapsed = time.time() - bucket["last_reset"]
-            if elapsed >= 60:
-                return limit
-            return max(0, limit - bucket["count"])
+        """Get whole tokens currently available for a service."""
+        with self._cond:
+            bucket = self._refill(service, time.monotonic())
+            return max(0, int(bucket["tokens"]))
 
     def get_stats(self) -> dict:
         """Get current rate limit stats for all services."""
         stats = {}
-        with self._lock:
-            for service, bucket in self._tokens.items():
+        with self._cond:
+            now = time.monotonic()
+            for service in list(self._buckets):
                 limit = self._limits.get(service, 60)
-                elapsed = time.time() - bucket["last_reset"]
+                bucket = self._refill(service, now)
+                remaining = max(0, int(bucket["tokens"]))
                 stats[service] = {
-                    "used": bucket["count"],
+                    "used": limit - remaining,
                     "limit": limit,
-                    "remaining": max(0, limit - bucket["count"]),
-                    "resets_in": max(0, 60 - elapsed),
+                    "remaining": remaining,
+                    "resets_in": max(0.0, (limit - bucket["tokens"]) * self.WINDOW / limit),
                 }
         return stats
 
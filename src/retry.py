@@ -4,6 +4,7 @@ Simple, no external dependencies.
 """
 
 import random
+import threading
 import time
 from collections.abc import Callable
 from functools import wraps
@@ -11,6 +12,17 @@ from functools import wraps
 from .constants import DEFAULT_RETRY_DELAY, MAX_RETRY_ATTEMPTS, MAX_RETRY_DELAY
 from .logger import logger
 
+# Per-thread RNG for jitter so concurrent retries don't share the module-level generator
+_thread_local = threading.local()
+
+
+def _get_rng() -> random.Random:
+    """Get the calling thread's jitter RNG, creating it on first use."""
+    rng = getattr(_thread_local, "rng", None)
+    if rng is None:
+        rng = _thread_local.rng = random.Random()
+    return rng
+
 
 class RetryError(Exception):
     """Raised when all retry attempts fail."""
@@ -47,6 +59,9 @@ def retry_with_backoff(
             return requests.get(url)
     """
 
+    # Backoff schedule is fixed per decorator, so compute it once: delay before retry N is _delays[N - 1]
+    _delays = tuple(min(base_delay * (exponential_base**i), max_delay) for i in range(max(max_attempts - 1, 0)))
+
     def decorator(func: Callable):
         @wraps(func)
         def wrapper(*args, **kwargs):
@@ -66,12 +81,11 @@ def retry_with_backoff(
                             f"{func.__name__} failed after {max_attempts} attempts: {e}", last_exception=e
                         ) from e
 
-                    # Calculate delay with exponential backoff
-                    delay = min(base_delay * (exponential_base ** (attempt - 1)), max_delay)
+                    delay = _delays[attempt - 1]
 
                     # Add jitter (±25%)
                     if jitter:
-                        delay = delay * (0.75 + random.random() * 0.5)
+                        delay *= _get_rng().uniform(0.75, 1.25)
 
                     logger.warning(
                         "retry.attempting",
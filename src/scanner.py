@@ -8,25 +8,56 @@ Extracted from main.py for better separation of concerns.
 """
 
 import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import date, datetime
 
+import pandas as pd
 import sentry_sdk
-import yfinance as yf
 
-from .analytics import Analytics
-from .backup import NotionBackup
-from .cache import MarketCapCache
+from .analytics import get_analytics
+from .backup import get_backup
+from .cache import MarketCapCache, get_market_cap_cache
 from .config import Config
-from .constants import BATCH_SLEEP_SECONDS
-from .data_source_yfinance import daily_ohlc
-from .filters import check_market_filter, check_wavetrend_signal
+from .constants import NOTION_WRITE_WORKERS, PERFORMANCE_MAX_SIGNAL_AGE_DAYS, SCAN_MAX_WORKERS
+from .data_source_yfinance import batch_4h_ohlc, batch_daily_ohlc, clear_ohlc_cache, daily_ohlc
+from .filters import check_market_filter, check_wavetrend_signal, prefetch_market_caps
 from .health import get_health
+from .indicators import invalidate as invalidate_indicators
 from .indicators import mfi, mfi_uptrend, stoch_rsi_buy, stochastic_rsi, wavetrend
 from .logger import logger, set_correlation_id
 from .market_symbols import get_sp500_symbols
 from .notion_client import NotionClient
-from .signal_tracker import SignalTracker
+from .signal_tracker import SignalTracker, get_signal_tracker
 from .telegram_client import TelegramClient
+from .timeparse import parse_iso
+
+# Telegram message for a confirmed Stage 2 signal; filled with format_map per alert
+_BUY_ALERT_TEMPLATE = "\n".join(
+    [
+        "🚨🚨🚨 **BUY SIGNAL CONFIRMED!** 🚨🚨🚨",
+        "━━━━━━━━━━━━━━━━━━━━━━",
+        "",
+        "**📈 SYMBOL: `{symbol}`**",
+        "💰 **Price:** ${price:.2f}",
+        "📊 [View on TradingView]({tradingview_link})",
+        "",
+        "**✅ TWO-STAGE FILTER PASSED:**",
+        "",
+        "**🔵 Stage 1:** Stochastic RSI + MFI",
+        "   • Stoch RSI: K={stoch_k:.2f}% | D={stoch_d:.2f}%",
+        "   • MFI: {mfi:.2f} (3-day uptrend ✓)",
+        "",
+        "**🟢 Stage 2:** WaveTrend Confirmation",
+        "   • WT1: {wt1:.2f}",
+        "   • WT2: {wt2:.2f}",
+        "   • **Oversold zone cross detected** 🎯",
+        "{perf}━━━━━━━━━━━━━━━━━━━━━━",
+        "📅 **Date:** {date}",
+        "🚀 **ACTION: STRONG BUY CANDIDATE**",
+        "━━━━━━━━━━━━━━━━━━━━━━",
+    ]
+)
 
 
 def update_signal_performance(signal_tracker: SignalTracker, lookback_days: int = 7) -> dict:
@@ -43,12 +74,16 @@ def update_signal_performance(signal_tracker: SignalTracker, lookback_days: int
     updated = 0
     failed = 0
 
+    # Collect symbols with signals old enough to evaluate, with the widest span each one needs
+    pending_counts: Counter[str] = Counter()
+    days_needed: dict[str, int] = {}
+    now = datetime.now()
     for signal in signal_tracker.data.get("signal_history", []):
         symbol = signal.get("symbol")
         if not symbol:
             continue
 
-        if signal.get("performance"):
+        if signal.get("performance") or signal.get("unevaluable"):
             continue
 
         try:
@@ -56,25 +91,148 @@ def update_signal_performance(signal_tracker: SignalTracker, lookback_days: int
             if not signal_date:
                 continue
 
-            signal_datetime = datetime.fromisoformat(signal_date)
-            days_since = (datetime.now() - signal_datetime).days
+            signal_datetime = parse_iso(signal_date)
+            days_since = (now - signal_datetime).days
 
             if days_since < lookback_days:
                 continue
 
-            ticker = yf.Ticker(symbol)
-            current_price = ticker.info.get("currentPrice") or ticker.info.get("regularMarketPrice")
+            # These can never be evaluated; flag them so they stop being retried and widening the fetch
+            if not (signal.get("data") or {}).get("price"):
+                signal_tracker.mark_unevaluable(signal, "no_entry_price")
+                failed += 1
+                continue
+            if days_since > PERFORMANCE_MAX_SIGNAL_AGE_DAYS:
+                signal_tracker.mark_unevaluable(signal, "too_old")
+                failed += 1
+                continue
 
-            if current_price:
-                signal_tracker.update_signal_performance(symbol, lookback_days)
-                updated += 1
+            pending_counts[symbol] += 1
+            days_needed[symbol] = max(days_needed.get(symbol, 0), days_since)
         except Exception as e:
             logger.warning("performance_update_failed", symbol=symbol, error=str(e))
             failed += 1
 
+    if not pending_counts:
+        return {"updated": updated, "failed": failed}
+
+    # Batched downloads instead of a daily_ohlc fetch per signal; symbols are bucketed by the span
+    # they need (rounded up to 10 days) so one old signal doesn't widen every symbol's window
+    buckets: dict[int, list[str]] = {}
+    for symbol, days_since in days_needed.items():
+        span = -(-(days_since + 10) // 10) * 10
+        buckets.setdefault(span, []).append(symbol)
+    ohlc: dict[str, pd.DataFrame] = {}
+    for span, symbols in sorted(buckets.items()):
+        ohlc.update(batch_daily_ohlc(symbols, days=span))
+
+    # A symbol call may evaluate several signals or none, so count signals via the tracker's running total
+    evaluated_before = signal_tracker.get_all_stats()["evaluated"]
+
+    # Save the tracker once for the whole batch instead of after every evaluated signal
+    with signal_tracker.deferred_save():
+        # Each call evaluates every pending signal of that symbol
+        for symbol, count in pending_counts.items():
+            df = ohlc.get(symbol)
+            if df is None:
+                logger.warning("performance_no_data", symbol=symbol, signals=count)
+                failed += count
+                continue
+
+            try:
+                signal_tracker.update_signal_performance(symbol, lookback_days, df=df)
+            except Exception as e:
+                logger.warning("performance_update_failed", symbol=symbol, error=str(e))
+                failed += count
+
+    updated = signal_tracker.get_all_stats()["evaluated"] - evaluated_before
     return {"updated": updated, "failed": failed}
 
 
+def _scan_symbol(symbol: str, cache: MarketCapCache, df: pd.DataFrame | None = None) -> dict | None:
+    """
+    Run Stage 0 filter and Stage 1 signal check for one symbol.
+
+    Safe to call from worker threads: it only reads market data and the
+    (thread-safe) market cap cache, never Notion.
+
+    Args:
+        symbol: Stock ticker symbol
+        cache: Shared market cap cache
+        df: Prefetched daily OHLC data; fetched per symbol when None
+
+    Returns:
+        None if the market filter did not pass, otherwise a dict with
+        'result' (market filter values) and 'signal' (Stage 1 signal found)
+    """
+    # === STAGE 0: Market Filter ===
+    result = check_market_filter(symbol, cache=cache, df=df)
+
+    if not result or not result.get("passed"):
+        return None
+
+    # === STAGE 1: Signal Check (Stoch RSI cross + MFI uptrend) ===
+    has_signal = False
+    try:
+        if df is None:
+            df = daily_ohlc(symbol)
+        if df is not None and len(df) >= 30:
+            stoch_ind = stochastic_rsi(df["Close"], rsi_period=14, stoch_period=14, k=3, d=3, symbol=symbol)
+            mfi_values = mfi(df, period=14, symbol=symbol)
+
+            has_signal = stoch_rsi_buy(stoch_ind) and mfi_uptrend(mfi_values, days=3)
+    except Exception as e:
+        logger.warning("signal_check_failed", symbol=symbol, error=str(e))
+
+    return {"result": result, "signal": has_signal}
+
+
+def _flush_notion_writes(func, calls: list[tuple]) -> list[bool]:
+    """
+    Run queued Notion write calls concurrently.
+
+    Args:
+        func: Notion client method (e.g. notion.add_to_signals)
+        calls: Positional argument tuples, one per call
+
+    Returns:
+        Success flag per call, in the order of calls. Exceptions are logged
+        and reported as False so one failed write doesn't abort the rest.
+    """
+    if not calls:
+        return []
+
+    def call(args: tuple) -> bool:
+        try:
+            return bool(func(*args))
+        except Exception as e:
+            logger.warning("notion_write_failed", call=getattr(func, "__name__", str(func)), args=args, error=str(e))
+            return False
+
+    with ThreadPoolExecutor(max_workers=min(NOTION_WRITE_WORKERS, len(calls))) as executor:
+        return list(executor.map(call, calls))
+
+
+def _flush_buy_updates(
+    notion: NotionClient, pages_to_delete: list[tuple[str, str]], buys_to_add: list[str], today_iso: str
+) -> None:
+    """Flush the signals-page deletes and BUY adds queued by a WaveTrend scan."""
+    if pages_to_delete or buys_to_add:
+        print("\n📝 Updating Notion...")
+
+    deleted = _flush_notion_writes(notion.delete_page, [(page_id,) for _, page_id in pages_to_delete])
+    for (symbol, _), success in zip(pages_to_delete, deleted, strict=True):
+        if success:
+            print(f"   🗑️  Removed {symbol} from signals")
+
+    added = _flush_notion_writes(notion.add_to_buy, [(symbol, today_iso) for symbol in buys_to_add])
+    for symbol, success in zip(buys_to_add, added, strict=True):
+        if success:
+            print(f"   ✅ Added {symbol} to BUY database")
+        else:
+            logger.warning("buy_add_failed", symbol=symbol)
+
+
 def run_market_scan(cfg: Config) -> dict | None:
     """
     Run Stage 1 market scanner: S&P 500 → filter + signal → Signals DB.
@@ -93,7 +251,7 @@ def run_market_scan(cfg: Config) -> dict | None:
     logger.info("market_scan_started")
 
     # Initialize cache for market cap data
-    cache = MarketCapCache()
+    cache = get_market_cap_cache()
     cache.clear_expired()
     cache_stats = cache.get_stats()
     logger.info("cache.initialized", **cache_stats)
@@ -106,9 +264,10 @@ def run_market_scan(cfg: Config) -> dict | None:
         buy_database_id=cfg.notion.buy_database_id,
     )
 
-    # Get symbols already in signals or buy databases (to avoid duplicates)
-    existing_symbols = notion.get_all_symbols()
-    existing_set = set(existing_symbols) if existing_symbols else set()
+    # Get symbols already in signals or buy databases once (to avoid duplicates and per-symbol queries)
+    signals_set = notion.get_signals_set()
+    buy_set = notion.get_buy_set()
+    existing_set = signals_set | buy_set
 
     # Get S&P 500 symbols
     sp500_symbols = get_sp500_symbols()
@@ -118,7 +277,6 @@ def run_market_scan(cfg: Config) -> dict | None:
     filter_passed_count = 0
     signal_found_count = 0
     added_count = 0
-    skipped_count = 0
 
     print(f"\n🔍 Market Scanner: Analyzing {len(sp500_symbols)} S&P 500 stocks...")
     print("📊 Stage 0 Filters: Market Cap ≥50B, Stoch RSI D<20, Price<BB Lower, MFI≤40")
@@ -128,64 +286,67 @@ def run_market_scan(cfg: Config) -> dict | None:
         print(f"⏭️  Skipping: {len(existing_set)} symbols already in signals/buy")
     print()
 
-    # Scan each symbol
-    for i, symbol in enumerate(sp500_symbols, 1):
-        if i % 50 == 0:
-            print(f"   Progress: {i}/{len(sp500_symbols)} symbols scanned...")
+    # Scan symbols concurrently (network-bound); Notion writes stay serial below
+    to_scan = [s for s in sp500_symbols if s.upper() not in existing_set]
+    skipped_count = len(sp500_symbols) - len(to_scan)
+    prefetch_market_caps(to_scan, cache)
+    ohlc = batch_daily_ohlc(to_scan)
+    signal_results: dict[str, dict] = {}
 
-        if symbol in existing_set:
-            skipped_count += 1
-            continue
-
-        # === STAGE 0: Market Filter ===
-        result = check_market_filter(symbol, cache=cache)
+    with ThreadPoolExecutor(max_workers=SCAN_MAX_WORKERS) as executor:
+        futures = {executor.submit(_scan_symbol, symbol, cache, ohlc.get(symbol)): symbol for symbol in to_scan}
 
-        if not result or not result.get("passed"):
-            continue
+        for done, future in enumerate(as_completed(futures), 1):
+            if done % 50 == 0:
+                print(f"   Progress: {done}/{len(to_scan)} symbols scanned...")
 
-        filter_passed_count += 1
-
-        # === STAGE 1: Signal Check (Stoch RSI cross + MFI uptrend) ===
-        try:
-            df = daily_ohlc(symbol)
-            if df is None or len(df) < 30:
+            scan = future.result()
+            if scan is None:
                 continue
 
-            stoch_ind = stochastic_rsi(df["Close"], rsi_period=14, stoch_period=14, k=3, d=3)
-            mfi_values = mfi(df, period=14)
-
-            has_stoch_signal = stoch_rsi_buy(stoch_ind)
-            mfi_trending_up = mfi_uptrend(mfi_values, days=3)
-
-            if has_stoch_signal and mfi_trending_up:
+            filter_passed_count += 1
+            if scan["signal"]:
                 signal_found_count += 1
+                signal_results[futures[future]] = scan["result"]
 
-                if notion.symbol_exists_in_signals(symbol):
-                    print(f"   ℹ️  {symbol}: Already in signals (skipped)")
-                else:
-                    success = notion.add_to_signals(symbol, date.today().isoformat())
-                    if success:
-                        added_count += 1
-                        print(f"   🆕 {symbol}: Added to Signals DB")
-                        print(f"      Market Cap: ${result['market_cap'] / 1e9:.1f}B")
-                        print(f"      Stoch RSI D: {result['stoch_d']:.1f}, K: {result['stoch_k']:.1f}")
-                        print(f"      Price: ${result['price']:.2f} < BB Lower: ${result['bb_lower']:.2f}")
-                        print(f"      MFI: {result['mfi']:.1f} (3-day uptrend ✓)")
+    # Write new signals to Notion concurrently, then report in S&P list order
+    # to_scan already excludes symbols in signals/buy, so every hit is new
+    new_signals = [symbol for symbol in to_scan if symbol in signal_results]
 
-        except Exception as e:
-            logger.warning("signal_check_failed", symbol=symbol, error=str(e))
+    today_iso = date.today().isoformat()
+    added = _flush_notion_writes(notion.add_to_signals, [(symbol, today_iso) for symbol in new_signals])
+
+    # Build the report first and write it to stdout in one call
+    report_lines: list[str] = []
+    for symbol, success in zip(new_signals, added, strict=True):
+        if not success:
+            logger.warning("signal_add_failed", symbol=symbol)
             continue
 
+        result = signal_results[symbol]
+        signals_set.add(symbol.upper())
+        added_count += 1
+        report_lines += [
+            f"   🆕 {symbol}: Added to Signals DB",
+            f"      Market Cap: ${result['market_cap'] / 1e9:.1f}B",
+            f"      Stoch RSI D: {result['stoch_d']:.1f}, K: {result['stoch_k']:.1f}",
+            f"      Price: ${result['price']:.2f} < BB Lower: ${result['bb_lower']:.2f}",
+            f"      MFI: {result['mfi']:.1f} (3-day uptrend ✓)",
+        ]
+
+    if report_lines:
+        print("\n".join(report_lines))
+
     # Update signal performance
     print("\n📊 Updating signal performance metrics...")
-    signal_tracker = SignalTracker()
+    signal_tracker = get_signal_tracker()
     perf_update = update_signal_performance(signal_tracker, lookback_days=7)
     print(f"   ✅ Performance updated: {perf_update['updated']} signals evaluated")
     if perf_update["failed"] > 0:
         print(f"   ⚠️  Failed to evaluate: {perf_update['failed']} signals")
 
     # Record analytics
-    analytics = Analytics()
+    analytics = get_analytics()
     analytics.record_market_scan(filter_passed_count, added_count, 0)
     analytics.record_stage1_scan(
         checked=filter_passed_count,  # Only those that passed market filter get Stage 1 check
@@ -194,7 +355,7 @@ def run_market_scan(cfg: Config) -> dict | None:
 
     # Backup Notion databases
     print("\n💾 Backing up Notion databases...")
-    backup = NotionBackup()
+    backup = get_backup()
     databases = {"signals": cfg.notion.signals_database_id, "buy": cfg.notion.buy_database_id}
     backup.backup_all(notion, databases)
 
@@ -262,12 +423,16 @@ def run_wavetrend_scan(cfg: Config) -> dict | None:
     Returns:
         dict with scan statistics, or None on error
     """
+    today = date.today()
+    today_iso = today.isoformat()
+    today_str = today.strftime("%Y-%m-%d")
+
     # Initialize clients and trackers
     notion = NotionClient(
         cfg.notion.api_token, cfg.notion.database_id, cfg.notion.signals_database_id, cfg.notion.buy_database_id
     )
     telegram = TelegramClient(cfg.telegram.bot_token, cfg.telegram.chat_id)
-    signal_tracker = SignalTracker()
+    signal_tracker = get_signal_tracker()
 
     # Cleanup old signals
     print("🧹 Cleaning up old signals...")
@@ -304,148 +469,131 @@ def run_wavetrend_scan(cfg: Config) -> dict | None:
         return {"checked": 0, "confirmed": 0}
 
     # Get symbols already in buy database
-    buy_symbols = set()
+    buy_symbols: set[str] = set()
     if cfg.notion.buy_database_id:
-        try:
-            buy_symbols = set(notion._get_symbols_from_database(cfg.notion.buy_database_id))
-            if buy_symbols:
-                logger.info("existing_buy_symbols", count=len(buy_symbols), symbols=list(buy_symbols))
-                print(f"ℹ️  Skipping {len(buy_symbols)} symbols already in buy: {', '.join(sorted(buy_symbols))}\n")
-        except Exception as e:
-            logger.warning("get_buy_symbols_failed", error=str(e))
+        buy_symbols = notion.get_buy_set()
+        if buy_symbols:
+            logger.info("existing_buy_symbols", count=len(buy_symbols), symbols=list(buy_symbols))
+            print(f"ℹ️  Skipping {len(buy_symbols)} symbols already in buy: {', '.join(sorted(buy_symbols))}\n")
 
     print(f"📋 Signals to check: {len(symbols)} symbols")
     print(f"   {', '.join(symbols)}\n")
 
-    # Check each symbol
+    # Prefetch 4h (primary signal) and daily (fallback + alert values) bars in batched downloads;
+    # check_wavetrend_signal and daily_ohlc below are then served from the OHLC cache
+    to_check = [s for s in symbols if s.upper() not in buy_symbols]
+    batch_4h_ohlc(to_check)
+    batch_daily_ohlc(to_check)
+
+    # Check each symbol; Notion writes are queued and flushed after the loop
     confirmed_signals = []
     skipped_buy = []
+    pages_to_delete: list[tuple[str, str]] = []  # (symbol, signals page_id)
+    buys_to_add: list[str] = []
 
-    for i, symbol in enumerate(symbols, 1):
-        print(f"🌊 [{i}/{len(symbols)}] Checking WaveTrend for {symbol}...", end=" ")
+    # Flush in finally: alerts already sent must get their Notion updates even if a later symbol raises
+    try:
+        for i, symbol in enumerate(symbols, 1):
+            print(f"🌊 [{i}/{len(symbols)}] Checking WaveTrend for {symbol}...", end=" ")
 
-        if symbol in buy_symbols:
-            print("⏭️  (already in buy)")
-            skipped_buy.append(symbol)
-            continue
+            if symbol.upper() in buy_symbols:
+                print("⏭️  (already in buy)")
+                skipped_buy.append(symbol)
+                continue
 
-        has_wt_signal = check_wavetrend_signal(symbol)
+            has_wt_signal = check_wavetrend_signal(symbol)
 
-        if has_wt_signal:
-            can_alert, reason = signal_tracker.can_send_alert(symbol, daily_limit=5, cooldown_days=7)
+            if has_wt_signal:
+                can_alert, reason = signal_tracker.can_send_alert(symbol, daily_limit=5, cooldown_days=7)
 
-            if not can_alert:
-                print(f"⚠️  SIGNAL BUT ALERT BLOCKED: {reason}")
-                logger.warning("alert_blocked", symbol=symbol, reason=reason)
-                confirmed_signals.append(symbol)
+                if not can_alert:
+                    print(f"⚠️  SIGNAL BUT ALERT BLOCKED: {reason}")
+                    logger.warning("alert_blocked", symbol=symbol, reason=reason)
+                    confirmed_signals.append(symbol)
 
-                if cfg.notion.buy_database_id:
-                    page_id = symbol_to_page.get(symbol)
-                    if page_id:
-                        notion.delete_page(page_id)
+                    if cfg.notion.buy_database_id:
+                        page_id = symbol_to_page.get(symbol)
+                        if page_id:
+                            pages_to_delete.append((symbol, page_id))
 
-                    if notion.symbol_exists_in_buy(symbol):
-                        print(f"   ℹ️  {symbol} already in BUY (skipped)")
-                    else:
-                        notion.add_to_buy(symbol, date.today().isoformat())
-                        print(f"   ✅ Added {symbol} to BUY (no alert)")
-                continue
+                        if symbol.upper() in buy_symbols:
+                            print(f"   ℹ️  {symbol} already in BUY (skipped)")
+                        else:
+                            buy_symbols.add(symbol.upper())
+                            buys_to_add.append(symbol)
+                    continue
 
-            print("✅ CONFIRMED!")
-            confirmed_signals.append(symbol)
+                print("✅ CONFIRMED!")
+                confirmed_signals.append(symbol)
 
-            # Get indicator values for message
-            df = daily_ohlc(symbol)
-            if df is None or len(df) < 30:
-                logger.warning("confirmed_signal_data_unavailable", symbol=symbol)
-                continue
+                # Get indicator values for message
+                df = daily_ohlc(symbol)
+                if df is None or len(df) < 30:
+                    logger.warning("confirmed_signal_data_unavailable", symbol=symbol)
+                    continue
+
+                wt = wavetrend(df, channel_length=10, average_length=21, symbol=symbol)
+                stoch = stochastic_rsi(df["Close"], symbol=symbol)
+                mfi_val = mfi(df, symbol=symbol)
+                current_price = float(df["Close"].iat[-1])
+                last = {
+                    "stoch_k": float(stoch["k"].iat[-1]),
+                    "stoch_d": float(stoch["d"].iat[-1]),
+                    "mfi": float(mfi_val.iat[-1]),
+                    "wt1": float(wt["wt1"].iat[-1]),
+                    "wt2": float(wt["wt2"].iat[-1]),
+                }
 
-            wt = wavetrend(df, channel_length=10, average_length=21)
-            stoch = stochastic_rsi(df["Close"])
-            mfi_val = mfi(df)
-            current_price = float(df["Close"].iloc[-1])
-
-            # Get historical performance
-            perf_stats = signal_tracker.get_signal_stats(symbol)
-            perf_text = ""
-            if perf_stats["evaluated"] > 0:
-                perf_text = f"\n📊 **Historical Performance ({symbol}):**\n   • Win Rate: {perf_stats['win_rate']}% | Avg Return: {perf_stats['avg_return']}%\n"
-
-            # Build Telegram notification
-            today_str = date.today().strftime("%Y-%m-%d")
-            tradingview_link = f"https://www.tradingview.com/chart/?symbol={symbol}"
-
-            message_lines = [
-                "🚨🚨🚨 **BUY SIGNAL CONFIRMED!** 🚨🚨🚨",
-                "━━━━━━━━━━━━━━━━━━━━━━",
-                "",
-                f"**📈 SYMBOL: `{symbol}`**",
-                f"💰 **Price:** ${current_price:.2f}",
-                f"📊 [View on TradingView]({tradingview_link})",
-                "",
-                "**✅ TWO-STAGE FILTER PASSED:**",
-                "",
-                "**🔵 Stage 1:** Stochastic RSI + MFI",
-                f"   • Stoch RSI: K={stoch['k'].iloc[-1] * 100:.2f}% | D={stoch['d'].iloc[-1] * 100:.2f}%",
-                f"   • MFI: {mfi_val.iloc[-1]:.2f} (3-day uptrend ✓)",
-                "",
-                "**🟢 Stage 2:** WaveTrend Confirmation",
-                f"   • WT1: {wt['wt1'].iloc[-1]:.2f}",
-                f"   • WT2: {wt['wt2'].iloc[-1]:.2f}",
-                "   • **Oversold zone cross detected** 🎯",
-            ]
-
-            if perf_text:
-                message_lines.append(perf_text)
-
-            message_lines.extend(
-                [
-                    "━━━━━━━━━━━━━━━━━━━━━━",
-                    f"📅 **Date:** {today_str}",
-                    "🚀 **ACTION: STRONG BUY CANDIDATE**",
-                    "━━━━━━━━━━━━━━━━━━━━━━",
-                ]
-            )
-
-            message = "\n".join(message_lines)
+                # Get historical performance
+                perf_stats = signal_tracker.get_signal_stats(symbol)
+                perf_text = ""
+                if perf_stats["evaluated"] > 0:
+                    perf_text = f"\n📊 **Historical Performance ({symbol}):**\n   • Win Rate: {perf_stats['win_rate']}% | Avg Return: {perf_stats['avg_return']}%\n"
+
+                # Build Telegram notification
+                message = _BUY_ALERT_TEMPLATE.format_map(
+                    {
+                        "symbol": symbol,
+                        "price": current_price,
+                        "tradingview_link": f"https://www.tradingview.com/chart/?symbol={symbol}",
+                        "stoch_k": last["stoch_k"] * 100,
+                        "stoch_d": last["stoch_d"] * 100,
+                        "mfi": last["mfi"],
+                        "wt1": last["wt1"],
+                        "wt2": last["wt2"],
+                        "perf": f"{perf_text}\n" if perf_text else "",
+                        "date": today_str,
+                    }
+                )
 
-            try:
-                telegram.send(message)
-                logger.info("wavetrend_telegram_sent", symbol=symbol)
-
-                signal_data = {
-                    "price": current_price,
-                    "stoch_k": float(stoch["k"].iloc[-1]),
-                    "stoch_d": float(stoch["d"].iloc[-1]),
-                    "mfi": float(mfi_val.iloc[-1]),
-                    "wt1": float(wt["wt1"].iloc[-1]),
-                    "wt2": float(wt["wt2"].iloc[-1]),
-                }
-                signal_tracker.record_alert(symbol, signal_data)
-
-                # Record alert in analytics for weekly report
-                analytics = Analytics()
-                analytics.record_alert_sent(symbol, current_price)
-
-                page_id = symbol_to_page.get(symbol)
-                if page_id:
-                    notion.delete_page(page_id)
-                    print(f"   🗑️  Removed {symbol} from signals")
-
-                if cfg.notion.buy_database_id:
-                    if notion.symbol_exists_in_buy(symbol):
-                        print(f"   ℹ️  {symbol} already in BUY database (skipped)")
-                    else:
-                        notion.add_to_buy(symbol, date.today().isoformat())
-                        print(f"   ✅ Added {symbol} to BUY database")
-            except Exception as e:
-                logger.error("wavetrend_telegram_failed", symbol=symbol, error=str(e))
-                print(f"   ⚠️  Failed to send Telegram: {e}")
-        else:
-            print("—")
+                try:
+                    telegram.send(message)
+                    logger.info("wavetrend_telegram_sent", symbol=symbol)
+
+                    signal_data = {"price": current_price, **last}
+                    signal_tracker.record_alert(symbol, signal_data)
 
-        if i < len(symbols):
-            time.sleep(BATCH_SLEEP_SECONDS)
+                    # Record alert in analytics for weekly report
+                    analytics = get_analytics()
+                    analytics.record_alert_sent(symbol, current_price)
+
+                    page_id = symbol_to_page.get(symbol)
+                    if page_id:
+                        pages_to_delete.append((symbol, page_id))
+
+                    if cfg.notion.buy_database_id:
+                        if symbol.upper() in buy_symbols:
+                            print(f"   ℹ️  {symbol} already in BUY database (skipped)")
+                        else:
+                            buy_symbols.add(symbol.upper())
+                            buys_to_add.append(symbol)
+                except Exception as e:
+                    logger.error("wavetrend_telegram_failed", symbol=symbol, error=str(e))
+                    print(f"   ⚠️  Failed to send Telegram: {e}")
+            else:
+                print("—")
+    finally:
+        _flush_buy_updates(notion, pages_to_delete, buys_to_add, today_iso)
 
     # Summary
     print("\n✅ WaveTrend scan complete!")
@@ -459,7 +607,7 @@ def run_wavetrend_scan(cfg: Config) -> dict | None:
             print(f"   • {s}")
 
     # Record analytics
-    analytics = Analytics()
+    analytics = get_analytics()
     analytics.record_stage2_scan(checked=len(symbols) - len(skipped_buy), confirmed=len(confirmed_signals))
 
     logger.info(
@@ -513,6 +661,8 @@ def run_continuous(cfg: Config, interval: int = 3600) -> None:
                 # Stage 1: Market Scanner (once per day)
                 today = date.today()
                 if last_market_scan_date != today:
+                    invalidate_indicators()
+                    clear_ohlc_cache()
                     try:
                         print("🔍 Stage 1: Daily Market Scanner (S&P 500 → Signals DB)...\n")
                         result = run_market_scan(cfg)
@@ -9,10 +9,33 @@ Features:
 """
 
 import json
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from pathlib import Path
 
+import numpy as np
+import pandas as pd
+
+from .constants import PERFORMANCE_MAX_SIGNAL_AGE_DAYS
+from .data_source_yfinance import daily_ohlc
 from .logger import logger
+from .timeparse import parse_iso
+
+# One-slot cache of (day start, next day start, ISO date string) in local epoch seconds
+_TODAY_CACHE: list = [0.0, 0.0, ""]
+
+
+def _today_iso(now_ts: float) -> str:
+    """Return the local ISO date for an epoch timestamp, rebuilt only when the day changes."""
+    if not _TODAY_CACHE[0] <= now_ts < _TODAY_CACHE[1]:
+        day = datetime.fromtimestamp(now_ts).date()
+        start = datetime.combine(day, datetime.min.time())
+        _TODAY_CACHE[0] = start.timestamp()
+        _TODAY_CACHE[1] = (start + timedelta(days=1)).timestamp()
+        _TODAY_CACHE[2] = day.isoformat()
+    return _TODAY_CACHE[2]
 
 
 class SignalTracker:
@@ -21,31 +44,127 @@ class SignalTracker:
     def __init__(self, data_file: str = "signal_tracker.json"):
         self.data_file = Path(data_file)
         self.data = self._load_data()
+        # Aggregates for get_signal_stats() and a per-symbol index of signal_history;
+        # both are rebuilt lazily when signal_history is replaced
+        self._counters: dict = {}
+        self._by_symbol: dict[str, list[dict]] = {}
+        self._derived_key: tuple[int, int] | None = None
+        # Unsaved changes and whether to write them immediately (see deferred_save)
+        self._dirty = False
+        self._autosave = True
+        # Day daily_alerts was last pruned on; pruning only needs to run once per day
+        self._last_prune_day: str | None = None
+
+    def _history_key(self) -> tuple[int, int]:
+        history = self.data["signal_history"]
+        return id(history), len(history)
+
+    def _sync_derived(self):
+        """Rebuild the running aggregates and per-symbol index if signal_history was swapped out"""
+        key = self._history_key()
+        if self._derived_key == key:
+            return
+
+        self._counters = {
+            "total": 0,
+            "evaluated": 0,
+            "wins": 0,
+            "returns_sum": 0.0,
+            "returns_min": float("inf"),
+            "returns_max": float("-inf"),
+        }
+        self._by_symbol = {}
+        for signal in self.data["signal_history"]:
+            self._counters["total"] += 1
+            self._by_symbol.setdefault(signal.get("symbol"), []).append(signal)
+            if "performance" in signal:
+                self._count_return(signal["performance"]["return_pct"])
+        self._derived_key = key
+
+    def _get_counters(self) -> dict:
+        """Return running aggregates over signal_history"""
+        self._sync_derived()
+        return self._counters
+
+    def _signals_for(self, symbol: str) -> list[dict]:
+        """Return the signals recorded for one symbol, in history order"""
+        self._sync_derived()
+        return self._by_symbol.get(symbol, [])
+
+    def _count_return(self, return_pct: float):
+        counters = self._counters
+        counters["evaluated"] += 1
+        counters["wins"] += return_pct > 0
+        counters["returns_sum"] += return_pct
+        counters["returns_min"] = min(counters["returns_min"], return_pct)
+        counters["returns_max"] = max(counters["returns_max"], return_pct)
 
     def _load_data(self) -> dict:
         """Load signal tracking data from JSON file"""
         if not self.data_file.exists():
             return {
                 "daily_alerts": {},  # date -> count
-                "symbol_cooldown": {},  # symbol -> last_alert_date
+                "symbol_cooldown": {},  # symbol -> last alert (epoch seconds)
                 "signal_history": [],  # list of signals with performance
             }
 
         try:
             with open(self.data_file) as f:
-                return json.load(f)
+                data = json.load(f)
         except Exception as e:
             logger.error("signal_tracker.load_failed", error=str(e))
             return {"daily_alerts": {}, "symbol_cooldown": {}, "signal_history": []}
 
+        # Migrate legacy ISO-string cooldowns to epoch seconds
+        cooldown = data.get("symbol_cooldown", {})
+        for symbol, last_alert in cooldown.items():
+            if isinstance(last_alert, str):
+                cooldown[symbol] = parse_iso(last_alert).timestamp()
+
+        return data
+
     def _save_data(self):
         """Save signal tracking data to JSON file"""
         try:
-            with open(self.data_file, "w") as f:
-                json.dump(self.data, f, indent=2)
+            # Compact JSON to a temp file, then atomic replace so a crash never leaves a truncated file
+            temp_file = self.data_file.with_suffix(".json.tmp")
+            with open(temp_file, "w") as f:
+                json.dump(self.data, f, separators=(",", ":"))
+            temp_file.replace(self.data_file)
         except Exception as e:
             logger.error("signal_tracker.save_failed", error=str(e))
 
+    def _mark_dirty(self):
+        """Record unsaved changes, writing them now unless saves are deferred"""
+        self._dirty = True
+        if self._autosave:
+            self.flush()
+
+    def flush(self):
+        """Write pending changes to disk, if any"""
+        if self._dirty:
+            self._save_data()
+            self._dirty = False
+
+    @contextmanager
+    def deferred_save(self) -> Iterator["SignalTracker"]:
+        """
+        Batch all saves made inside the block into a single write on exit.
+
+        Example:
+            with tracker.deferred_save():
+                for symbol in symbols:
+                    tracker.update_signal_performance(symbol)
+        """
+        previous = self._autosave
+        self._autosave = False
+        try:
+            yield self
+        finally:
+            self._autosave = previous
+            if previous:
+                self.flush()
+
     def can_send_alert(self, symbol: str, daily_limit: int = 5, cooldown_days: int = 7) -> tuple[bool, str]:
         """
         Check if alert can be sent based on daily limit and cooldown.
@@ -58,7 +177,8 @@ class SignalTracker:
         Returns:
             (can_send, reason) tuple
         """
-        today = datetime.now().date().isoformat()
+        now_ts = time.time()
+        today = _today_iso(now_ts)
 
         # Check daily limit
         today_count = self.data["daily_alerts"].get(today, 0)
@@ -66,14 +186,12 @@ class SignalTracker:
             logger.warning("alert_limit_reached", date=today, count=today_count, limit=daily_limit)
             return False, f"Daily limit reached ({today_count}/{daily_limit})"
 
-        # Check symbol cooldown
-        if symbol in self.data["symbol_cooldown"]:
-            last_alert = datetime.fromisoformat(self.data["symbol_cooldown"][symbol])
-            days_since = (datetime.now() - last_alert).days
-
-            if days_since < cooldown_days:
-                logger.info("symbol_in_cooldown", symbol=symbol, days_since=days_since, required=cooldown_days)
-                return False, f"Symbol in cooldown ({days_since}/{cooldown_days} days)"
+        # Check symbol cooldown: a single compare against the expiry; days are only derived for the message
+        last_alert = self.data["symbol_cooldown"].get(symbol)
+        if last_alert is not None and now_ts < last_alert + cooldown_days * 86400:
+            days_since = int((now_ts - last_alert) // 86400)
+            logger.info("symbol_in_cooldown", symbol=symbol, days_since=days_since, required=cooldown_days)
+            return False, f"Symbol in cooldown ({days_since}/{cooldown_days} days)"
 
         return True, "OK"
 
@@ -85,41 +203,45 @@ class SignalTracker:
             symbol: Stock symbol
             signal_data: Dictionary with signal details (price, indicators, etc.)
         """
-        today = datetime.now().date().isoformat()
-        now = datetime.now().isoformat()
+        now = datetime.now()
+        now_ts = now.timestamp()
+        today = _today_iso(now_ts)
+        now_iso = now.isoformat()
 
         # Increment daily count
         self.data["daily_alerts"][today] = self.data["daily_alerts"].get(today, 0) + 1
 
         # Update cooldown
-        self.data["symbol_cooldown"][symbol] = now
+        self.data["symbol_cooldown"][symbol] = now_ts
 
         # Add to signal history
-        signal_record = {"symbol": symbol, "date": now, "data": signal_data, "tracking_start": now}
+        signal_record = {"symbol": symbol, "date": now_iso, "data": signal_data, "tracking_start": now_iso}
+        self._sync_derived()
         self.data["signal_history"].append(signal_record)
+        self._counters["total"] += 1
+        self._by_symbol.setdefault(symbol, []).append(signal_record)
+        self._derived_key = self._history_key()
+
+        # Clean old daily alerts (keep last 7 days); entries only expire when the day rolls over
+        if self._last_prune_day != today:
+            cutoff_date = (now - timedelta(days=7)).date().isoformat()
+            self.data["daily_alerts"] = {
+                date: count for date, count in self.data["daily_alerts"].items() if date >= cutoff_date
+            }
+            self._last_prune_day = today
 
-        # Clean old daily alerts (keep last 7 days)
-        cutoff_date = (datetime.now() - timedelta(days=7)).date().isoformat()
-        self.data["daily_alerts"] = {
-            date: count for date, count in self.data["daily_alerts"].items() if date >= cutoff_date
-        }
-
-        self._save_data()
+        self._mark_dirty()
         logger.info("alert_recorded", symbol=symbol, daily_count=self.data["daily_alerts"][today])
 
     def get_daily_stats(self) -> dict:
         """Get daily alert statistics"""
-        today = datetime.now().date().isoformat()
+        now_ts = time.time()
+        today = _today_iso(now_ts)
+        cooldown_start = now_ts - 7 * 86400
         return {
             "date": today,
             "alerts_sent": self.data["daily_alerts"].get(today, 0),
-            "symbols_in_cooldown": len(
-                [
-                    s
-                    for s, date in self.data["symbol_cooldown"].items()
-                    if (datetime.now() - datetime.fromisoformat(date)).days < 7
-                ]
-            ),
+            "symbols_in_cooldown": sum(1 for ts in self.data["symbol_cooldown"].values() if ts > cooldown_start),
             "total_tracked_signals": len(self.data["signal_history"]),
         }
 
@@ -128,54 +250,90 @@ class SignalTracker:
         if symbol not in self.data["symbol_cooldown"]:
             return None
 
-        last_alert = datetime.fromisoformat(self.data["symbol_cooldown"][symbol])
-        days_since = (datetime.now() - last_alert).days
+        last_alert = self.data["symbol_cooldown"][symbol]
+        days_since = int((time.time() - last_alert) // 86400)
 
         return {
             "symbol": symbol,
-            "last_alert": last_alert.isoformat(),
+            "last_alert": datetime.fromtimestamp(last_alert).isoformat(),
             "days_since": days_since,
             "can_alert_after": 7 - days_since if days_since < 7 else 0,
         }
 
-    def update_signal_performance(self, symbol: str, days_after: int = 5) -> dict | None:
+    def mark_unevaluable(self, signal: dict, reason: str):
+        """Flag a signal whose performance can never be measured so it is no longer retried"""
+        signal["unevaluable"] = reason
+        logger.warning("signal_unevaluable", symbol=signal.get("symbol"), date=signal.get("date"), reason=reason)
+        self._mark_dirty()
+
+    def update_signal_performance(
+        self, symbol: str, days_after: int = 5, df: pd.DataFrame | None = None
+    ) -> dict | None:
         """
         Update performance for signals that are old enough to evaluate.
 
         Args:
             symbol: Stock symbol to update
             days_after: Days after signal to check performance (default: 5)
+            df: Prefetched daily OHLC data (e.g. from batch_daily_ohlc); fetched when None
 
         Returns:
             Performance data or None if not ready
         """
-        from .data_source_yfinance import daily_ohlc
-
         # Find signals for this symbol that are ready to evaluate
         now = datetime.now()
         updated_any = False
 
-        for signal in self.data["signal_history"]:
-            if signal["symbol"] != symbol:
-                continue
-
-            # Skip if already evaluated
-            if "performance" in signal:
+        pending: list[tuple[dict, datetime]] = []
+        max_days_since = 0
+        for signal in self._signals_for(symbol):
+            # Skip if already evaluated or given up on
+            if "performance" in signal or "unevaluable" in signal:
                 continue
 
             # Check if enough time has passed
-            signal_date = datetime.fromisoformat(signal["date"])
+            signal_date = parse_iso(signal["date"])
             days_since = (now - signal_date).days
 
             if days_since < days_after:
                 continue
 
-            # Get price data
-            try:
-                df = daily_ohlc(symbol, days=days_after + 10)
-                if df is None or len(df) < days_after:
-                    continue
+            # Without an entry price, or once too old, retrying only widens the price fetch
+            if not signal["data"].get("price"):
+                self.mark_unevaluable(signal, "no_entry_price")
+                continue
+            if days_since > PERFORMANCE_MAX_SIGNAL_AGE_DAYS:
+                self.mark_unevaluable(signal, "too_old")
+                continue
 
+            pending.append((signal, signal_date))
+            max_days_since = max(max_days_since, days_since)
+
+        if not pending:
+            return self.get_signal_stats(symbol)
+
+        # Get price data once for all pending signals (unless prefetched), wide enough to reach the oldest
+        if df is None:
+            try:
+                df = daily_ohlc(symbol, days=max_days_since + 10)
+            except Exception as e:
+                logger.error("signal_performance_update_failed", symbol=symbol, error=str(e))
+                return self.get_signal_stats(symbol)
+        if df is None or len(df) < days_after:
+            return self.get_signal_stats(symbol)
+
+        # Normalize bar dates once for the frame rather than per signal
+        # Bar dates live in the Date column (daily_ohlc resets the index)
+        # Convert to DatetimeIndex, remove timezone, then normalize
+        # This handles: DatetimeIndex, numpy.datetime64, timezone-aware
+        bar_dates = pd.DatetimeIndex(df["Date"] if "Date" in df.columns else df.index)
+        if bar_dates.tz is not None:
+            bar_dates = bar_dates.tz_localize(None)  # Remove timezone
+        bar_dates = bar_dates.normalize()
+        closes = df["Close"].to_numpy(dtype=float)
+
+        for signal, signal_date in pending:
+            try:
                 # Find signal price
                 signal_price = signal["data"].get("price", 0)
                 if signal_price == 0:
@@ -187,22 +345,14 @@ class SignalTracker:
 
                 # Convert both sides to pandas DatetimeIndex for safe comparison
                 # This handles numpy.ndarray vs Timestamp incompatibility
-                import pandas as pd
-
                 target_ts = pd.Timestamp(target_date).normalize()
 
-                # Convert index to DatetimeIndex, remove timezone, then normalize
-                # This handles: DatetimeIndex, numpy.datetime64, timezone-aware
-                idx = pd.DatetimeIndex(df.index)
-                if idx.tz is not None:
-                    idx = idx.tz_localize(None)  # Remove timezone
-                idx = idx.normalize()
+                # Both are timezone-naive - comparison is safe; bars are in date order,
+                # so a binary search finds the first bar on or after the target
+                pos = bar_dates.searchsorted(target_ts)
 
-                # Now both are timezone-naive DatetimeIndex - comparison is safe
-                future_prices = df.loc[idx >= target_ts]
-
-                if len(future_prices) > 0:
-                    future_price = float(future_prices["Close"].iloc[0])
+                if pos < len(closes):
+                    future_price = float(closes[pos])
                     price_change = ((future_price - signal_price) / signal_price) * 100
 
                     signal["performance"] = {
@@ -212,6 +362,7 @@ class SignalTracker:
                         "return_pct": round(price_change, 2),
                         "evaluated_at": now.isoformat(),
                     }
+                    self._count_return(signal["performance"]["return_pct"])
 
                     updated_any = True
                     logger.info(
@@ -222,7 +373,7 @@ class SignalTracker:
                 logger.error("signal_performance_update_failed", symbol=symbol, error=str(e))
 
         if updated_any:
-            self._save_data()
+            self._mark_dirty()
 
         return self.get_signal_stats(symbol)
 
@@ -236,10 +387,10 @@ class SignalTracker:
         Returns:
             Dictionary with performance metrics
         """
-        signals = self.data["signal_history"]
+        if not symbol:
+            return self._stats_from_counters()
 
-        if symbol:
-            signals = [s for s in signals if s["symbol"] == symbol]
+        signals = self._signals_for(symbol)
 
         evaluated_signals = [s for s in signals if "performance" in s]
 
@@ -252,17 +403,46 @@ class SignalTracker:
                 "win_rate": None,
             }
 
-        returns = [s["performance"]["return_pct"] for s in evaluated_signals]
-        wins = len([r for r in returns if r > 0])
+        returns = np.fromiter(
+            (s["performance"]["return_pct"] for s in evaluated_signals),
+            dtype=np.float64,
+            count=len(evaluated_signals),
+        )
+        wins = int((returns > 0).sum())
 
         return {
             "total_signals": len(signals),
             "evaluated": len(evaluated_signals),
             "pending": len(signals) - len(evaluated_signals),
-            "avg_return": round(sum(returns) / len(returns), 2),
+            "avg_return": round(float(returns.mean()), 2),
             "win_rate": round((wins / len(evaluated_signals)) * 100, 1),
-            "best_return": max(returns) if returns else None,
-            "worst_return": min(returns) if returns else None,
+            "best_return": float(returns.max()),
+            "worst_return": float(returns.min()),
+        }
+
+    def _stats_from_counters(self) -> dict:
+        """Build the all-symbol stats from the running counters without rescanning history"""
+        counters = self._get_counters()
+        total = counters["total"]
+        evaluated = counters["evaluated"]
+
+        if not evaluated:
+            return {
+                "total_signals": total,
+                "evaluated": 0,
+                "pending": total,
+                "avg_return": None,
+                "win_rate": None,
+            }
+
+        return {
+            "total_signals": total,
+            "evaluated": evaluated,
+            "pending": total - evaluated,
+            "avg_return": round(counters["returns_sum"] / evaluated, 2),
+            "win_rate": round((counters["wins"] / evaluated) * 100, 1),
+            "best_return": counters["returns_max"],
+            "worst_return": counters["returns_min"],
         }
 
     def get_all_stats(self) -> dict:
@@ -276,3 +456,15 @@ class SignalTracker:
             Dictionary with aggregate performance metrics for all signals
         """
         return self.get_signal_stats(symbol=None)
+
+
+# Global instance, reused across scan cycles so state is loaded from disk once
+_signal_tracker: SignalTracker | None = None
+
+
+def get_signal_tracker() -> SignalTracker:
+    """Get or create global signal tracker instance."""
+    global _signal_tracker
+    if _signal_tracker is None:
+        _signal_tracker = SignalTracker()
+    return _signal_tracker
@@ -1,3 +1,5 @@
+import json
+import logging
 import time
 
 import requests
@@ -25,13 +27,20 @@ class TelegramClient:
         """Get or create shared requests session for connection pooling."""
         if cls._session is None:
             cls._session = requests.Session()
-            adapter = requests.adapters.HTTPAdapter(pool_connections=2, pool_maxsize=5, max_retries=0)
+            cls._session.headers["Connection"] = "keep-alive"
+            # Non-blocking pool sized for bursts of sends; retries are handled in send()
+            adapter = requests.adapters.HTTPAdapter(
+                pool_connections=4, pool_maxsize=16, max_retries=0, pool_block=False
+            )
             cls._session.mount("https://", adapter)
             logger.debug("telegram.session_created")
         return cls._session
 
     def __init__(self, token: str, chat_id: str):
         self.base = f"https://api.telegram.org/bot{token}"
+        self._send_url = f"{self.base}/sendMessage"
+        # chat_id never changes, so its part of the sendMessage body is serialized once
+        self._payload_prefix = '{"chat_id":' + json.dumps(chat_id) + ',"parse_mode":'
         self.chat_id = chat_id
         self._consecutive_failures = 0
         self._max_consecutive_failures = 5
@@ -55,17 +64,20 @@ class TelegramClient:
         # Rate limit Telegram API calls
         rate_limit("telegram")
 
-        url = f"{self.base}/sendMessage"
+        url = self._send_url
         session = self._get_session()
+        body = (self._payload_prefix + json.dumps(parse_mode) + ',"text":' + json.dumps(text) + "}").encode()
         last_error = None
 
         for attempt in range(1, MAX_RETRY_ATTEMPTS + 1):
             try:
-                logger.debug("telegram.sending", preview=text[:50], attempt=attempt)
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("telegram.sending", preview=text[:50], attempt=attempt)
 
                 r = session.post(
                     url,
-                    json={"chat_id": self.chat_id, "text": text, "parse_mode": parse_mode},
+                    data=body,
+                    headers={"Content-Type": "application/json"},
                     timeout=TELEGRAM_TIMEOUT,
                 )
 
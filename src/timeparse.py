@@ -0,0 +1,16 @@
+"""Cached ISO-8601 parsing for timestamps that are re-read on every check."""
+
+from datetime import datetime
+from functools import lru_cache
+
+
+@lru_cache(maxsize=4096)
+def parse_iso(value: str) -> datetime:
+    """
+    Parse an ISO timestamp, memoized.
+
+    Stored dates (cooldowns, signal dates, cache and analytics timestamps) are
+    compared against "now" on every scan, so the same strings recur constantly.
+    datetime objects are immutable, so sharing cached instances is safe.
+    """
+    return datetime.fromisoformat(value)
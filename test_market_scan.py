@@ -3,11 +3,18 @@
 Test script for market scanner - scans only first 10 S&P 500 symbols
 """
 
-import time
+import io
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from src.cache import get_market_cap_cache
 from src.config import Config
-from src.notion_client import NotionClient
-from src.main import check_market_filter
+from src.constants import SCAN_MAX_WORKERS
+from src.data_source_yfinance import batch_daily_ohlc
+from src.filters import check_market_filter, prefetch_market_caps
 from src.market_symbols import get_sp500_symbols
+from src.notion_client import NotionClient
+
 
 def test_market_scan():
     """Test market scanner with first 10 symbols"""
@@ -40,43 +47,52 @@ def test_market_scan():
     print(f"\n🔍 Testing with {len(sp500_symbols)} symbols:")
     print(f"   {', '.join(sp500_symbols)}\n")
     
+    # Download daily bars for all symbols in one batched request instead of one per symbol
+    ohlc = batch_daily_ohlc(sp500_symbols)
+    
+    # Warm market caps through the batched quote endpoint so the filter skips ticker.info per symbol
+    cache = get_market_cap_cache()
+    prefetch_market_caps(sp500_symbols, cache)
+    
+    # Run the filters concurrently (market cap lookups are network-bound), then report in order
+    with ThreadPoolExecutor(max_workers=SCAN_MAX_WORKERS) as executor:
+        results = list(executor.map(lambda s: check_market_filter(s, cache=cache, df=ohlc.get(s)), sp500_symbols))
+    
     found_count = 0
     updated_count = 0
     added_count = 0
     
-    for i, symbol in enumerate(sp500_symbols, 1):
-        print(f"[{i}/{len(sp500_symbols)}] Checking {symbol}...", end=" ")
-        
-        # Check market filters
-        result = check_market_filter(symbol)
+    # Results are all in, so build the per-symbol report in memory and write it once
+    report = io.StringIO()
+    for i, (symbol, result) in enumerate(zip(sp500_symbols, results, strict=True), 1):
+        print(f"[{i}/{len(sp500_symbols)}] Checking {symbol}...", end=" ", file=report)
         
         if result is None:
-            print("❌ Data unavailable")
+            print("❌ Data unavailable", file=report)
             continue
         
         if result.get('passed'):
             found_count += 1
-            print(f"✅ MATCH!")
-            print(f"    Market Cap: ${result['market_cap']/1e9:.1f}B")
-            print(f"    Stoch RSI D: {result['stoch_d']:.1f}")
-            print(f"    Price: ${result['price']:.2f} < BB Lower: ${result['bb_lower']:.2f}")
-            print(f"    MFI: {result['mfi']:.1f}")
+            print(f"✅ MATCH!", file=report)
+            print(f"    Market Cap: ${result['market_cap']/1e9:.1f}B", file=report)
+            print(f"    Stoch RSI D: {result['stoch_d']:.1f}", file=report)
+            print(f"    Price: ${result['price']:.2f} < BB Lower: ${result['bb_lower']:.2f}", file=report)
+            print(f"    MFI: {result['mfi']:.1f}", file=report)
             
             # Check if already in watchlist
             if symbol in existing_symbols:
-                print(f"    → Already in watchlist, would UPDATE date")
+                print(f"    → Already in watchlist, would UPDATE date", file=report)
                 # Don't actually update in test
                 updated_count += 1
             else:
-                print(f"    → New symbol, would ADD to watchlist")
+                print(f"    → New symbol, would ADD to watchlist", file=report)
                 # Don't actually add in test
                 added_count += 1
         else:
             reason = result.get('reason', 'unknown')
-            print(f"⏭️  Rejected: {reason}")
-        
-        # Small delay to avoid rate limits
-        time.sleep(0.5)
+            print(f"⏭️  Rejected: {reason}", file=report)
+    
+    sys.stdout.write(report.getvalue())
     
     # Summary
     print(f"\n" + "=" * 60)
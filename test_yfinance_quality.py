@@ -33,14 +33,14 @@ if not hist_1d.empty and not hist_1h.empty:
 print('\n3. INFO vs HISTORY KARŞILAŞTIRMA:\n')
 info = ticker.info
 info_price = info.get('currentPrice') or info.get('regularMarketPrice', 0)
-hist_price = ticker.history(period='1d')['Close'].iloc[-1] if not ticker.history(period='1d').empty else 0
+hist = ticker.history(period='1d')
+hist_price = hist['Close'].iloc[-1] if not hist.empty else 0
 print(f'  ticker.info price: ${info_price:.2f}')
 print(f'  history price: ${hist_price:.2f}')
 print(f'  Fark: ${abs(info_price - hist_price):.2f}')
 
 # Test 4: Veri gecikmesi
 print('\n4. VERİ GECİKMESİ:\n')
-hist = ticker.history(period='1d')
 if not hist.empty:
     last_update = hist.index[-1]
     now = datetime.now(last_update.tzinfo)
@@ -51,10 +51,10 @@ if not hist.empty:
 
 # Test 5: Auto adjust karşılaştırma
 print('\n5. AUTO ADJUST FARKI:\n')
-hist_adj = ticker.history(period='5d', auto_adjust=True)
+# auto_adjust=False also returns 'Adj Close', so one request covers both
 hist_no_adj = ticker.history(period='5d', auto_adjust=False)
-if not hist_adj.empty and not hist_no_adj.empty:
-    print(f'  Auto adjust ON: ${hist_adj["Close"].iloc[-1]:.2f}')
+if not hist_no_adj.empty:
+    print(f'  Auto adjust ON: ${hist_no_adj["Adj Close"].iloc[-1]:.2f}')
     print(f'  Auto adjust OFF: ${hist_no_adj["Close"].iloc[-1]:.2f}')
 
 print('\n' + '='*60)
@@ -0,0 +1,16 @@
+"""Shared pytest fixtures."""
+
+import pytest
+
+from src.data_source_yfinance import clear_ohlc_cache
+from src.indicators import invalidate
+
+
+@pytest.fixture(autouse=True)
+def _isolate_ohlc_cache():
+    """Keep OHLC responses and indicator results cached by one test from leaking into the next."""
+    clear_ohlc_cache()
+    invalidate()
+    yield
+    clear_ohlc_cache()
+    invalidate()
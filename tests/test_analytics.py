@@ -4,7 +4,7 @@ import json
 from datetime import datetime, timedelta
 from unittest.mock import Mock
 
-from src.analytics import Analytics
+from src.analytics import Analytics, get_analytics
 
 
 class TestAnalyticsInit:
@@ -103,6 +103,21 @@ class TestRecordMarketScan:
 
         assert len(analytics.data["market_scans"]) == 2
 
+    def test_prunes_records_past_retention(self, tmp_path):
+        """Recording should drop records older than the retention window from memory and disk."""
+        data_file = tmp_path / "analytics.json"
+        analytics = Analytics(data_file=str(data_file))
+
+        analytics.data["market_scans"] = [
+            {"timestamp": (datetime.now() - timedelta(days=60)).isoformat(), "found": 1, "added": 0, "updated": 0},
+            {"timestamp": (datetime.now() - timedelta(days=3)).isoformat(), "found": 2, "added": 0, "updated": 0},
+        ]
+
+        analytics.record_market_scan(found=3, added=0, updated=0)
+
+        assert [s["found"] for s in analytics.data["market_scans"]] == [2, 3]
+        assert [s["found"] for s in json.loads(data_file.read_text())["market_scans"]] == [2, 3]
+
 
 class TestRecordStage1Scan:
     """Tests for record_stage1_scan method."""
@@ -224,6 +239,24 @@ class TestGetWeeklyStats:
 
         assert stats["avg_stage1_pass_rate"] == 30.0  # (20 + 40) / 2
 
+    def test_average_ignores_rows_outside_window(self, tmp_path):
+        """Rows older than 7 days should be excluded from averages, whatever their order."""
+        data_file = tmp_path / "analytics.json"
+        analytics = Analytics(data_file=str(data_file))
+
+        recent = datetime.now().isoformat()
+        old = (datetime.now() - timedelta(days=10)).isoformat()
+        analytics.data["stage2_scans"] = [
+            {"timestamp": recent, "checked": 10, "confirmed": 5, "confirmation_rate": 50.0},
+            {"timestamp": old, "checked": 10, "confirmed": 10, "confirmation_rate": 100.0},
+            {"timestamp": recent, "checked": 10, "confirmed": 1, "confirmation_rate": 10.0},
+        ]
+
+        stats = analytics.get_weekly_stats()
+
+        assert stats["stage2_scans"] == 2
+        assert stats["avg_stage2_confirm_rate"] == 30.0
+
     def test_returns_unique_alert_symbols(self, tmp_path):
         """Should return unique alert symbols."""
         data_file = tmp_path / "analytics.json"
@@ -393,6 +426,16 @@ class TestSaveDataErrorHandling:
         # Data is still in memory
         assert len(analytics.data["market_scans"]) == 1
 
+    def test_writes_atomically_without_leftover_temp_file(self, tmp_path):
+        """Should replace the data file in one step and leave no temp file behind."""
+        data_file = tmp_path / "analytics.json"
+        analytics = Analytics(data_file=str(data_file))
+
+        analytics.record_market_scan(found=10, added=1, updated=1)
+
+        assert json.loads(data_file.read_text())["market_scans"][0]["found"] == 10
+        assert not (tmp_path / "analytics.json.tmp").exists()
+
 
 class TestEdgeCases:
     """Tests for edge cases and boundary conditions."""
@@ -435,3 +478,16 @@ class TestEdgeCases:
 
         # Second instance should see the saved data
         assert len(analytics2.data["market_scans"]) == 1
+
+
+class TestGlobalAnalytics:
+    """Test global analytics singleton"""
+
+    def test_get_analytics_returns_same_instance(self):
+        """Test that get_analytics returns singleton"""
+        import src.analytics
+
+        src.analytics._analytics = None
+
+        assert get_analytics() is get_analytics()
+        assert isinstance(get_analytics(), Analytics)
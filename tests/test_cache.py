@@ -21,7 +21,7 @@ class TestMarketCapCacheInit:
     def test_loads_existing_cache_from_file(self, tmp_path):
         """Should load existing cache data from file."""
         cache_file = tmp_path / "cache.json"
-        existing_data = {"AAPL": {"market_cap": 3000000000000, "timestamp": datetime.now().isoformat()}}
+        existing_data = {"AAPL": {"market_cap": 3000000000000, "timestamp": datetime.now().timestamp()}}
         cache_file.write_text(json.dumps(existing_data))
 
         cache = MarketCapCache(cache_file=str(cache_file))
@@ -29,6 +29,17 @@ class TestMarketCapCacheInit:
         assert "AAPL" in cache.cache
         assert cache.cache["AAPL"]["market_cap"] == 3000000000000
 
+    def test_migrates_iso_timestamps_to_epoch_seconds(self, tmp_path):
+        """Should convert legacy ISO timestamps on load so lookups skip date parsing."""
+        cache_file = tmp_path / "cache.json"
+        added = datetime.now() - timedelta(hours=1)
+        cache_file.write_text(json.dumps({"AAPL": {"market_cap": 3000000000000, "timestamp": added.isoformat()}}))
+
+        cache = MarketCapCache(cache_file=str(cache_file))
+
+        assert cache.cache["AAPL"]["timestamp"] == pytest.approx(added.timestamp())
+        assert cache.get("AAPL") == 3000000000000
+
     def test_handles_corrupted_json_file(self, tmp_path):
         """Should return empty cache when JSON is corrupted."""
         cache_file = tmp_path / "cache.json"
@@ -64,7 +75,7 @@ class TestCacheGet:
         cache = MarketCapCache(cache_file=str(cache_file))
 
         # Set cache directly
-        cache.cache["AAPL"] = {"market_cap": 3000000000000, "timestamp": datetime.now().isoformat()}
+        cache.cache["AAPL"] = {"market_cap": 3000000000000, "timestamp": datetime.now().timestamp()}
 
         result = cache.get("AAPL")
 
@@ -76,7 +87,7 @@ class TestCacheGet:
         cache = MarketCapCache(cache_file=str(cache_file), ttl_hours=24)
 
         # Set expired cache (25 hours ago)
-        old_time = (datetime.now() - timedelta(hours=25)).isoformat()
+        old_time = (datetime.now() - timedelta(hours=25)).timestamp()
         cache.cache["AAPL"] = {"market_cap": 3000000000000, "timestamp": old_time}
 
         result = cache.get("AAPL")
@@ -89,7 +100,7 @@ class TestCacheGet:
         cache_file = tmp_path / "cache.json"
         cache = MarketCapCache(cache_file=str(cache_file), ttl_hours=24)
 
-        old_time = (datetime.now() - timedelta(hours=25)).isoformat()
+        old_time = (datetime.now() - timedelta(hours=25)).timestamp()
         cache.cache["AAPL"] = {"market_cap": 3000000000000, "timestamp": old_time}
         cache._save_cache()
 
@@ -121,7 +132,7 @@ class TestCacheSet:
 
         assert "timestamp" in cache.cache["AAPL"]
         # Verify timestamp is recent (within 5 seconds)
-        entry_time = datetime.fromisoformat(cache.cache["AAPL"]["timestamp"])
+        entry_time = datetime.fromtimestamp(cache.cache["AAPL"]["timestamp"])
         assert (datetime.now() - entry_time).total_seconds() < 5
 
     def test_persists_to_file(self, tmp_path):
@@ -153,6 +164,18 @@ class TestCacheSet:
 
         assert cache.cache["PENNY"]["market_cap"] == 0
 
+    def test_set_many_persists_all_entries(self, tmp_path):
+        """Should cache several symbols and save them in one write."""
+        cache_file = tmp_path / "cache.json"
+        cache = MarketCapCache(cache_file=str(cache_file))
+
+        cache.set_many({"AAPL": 3000000000000, "MSFT": 2800000000000})
+
+        saved_data = json.loads(cache_file.read_text())
+        assert saved_data["AAPL"]["market_cap"] == 3000000000000
+        assert saved_data["MSFT"]["market_cap"] == 2800000000000
+        assert cache.get("MSFT") == 2800000000000
+
 
 class TestClearExpired:
     """Tests for clear_expired method."""
@@ -162,8 +185,8 @@ class TestClearExpired:
         cache_file = tmp_path / "cache.json"
         cache = MarketCapCache(cache_file=str(cache_file), ttl_hours=24)
 
-        old_time = (datetime.now() - timedelta(hours=25)).isoformat()
-        recent_time = datetime.now().isoformat()
+        old_time = (datetime.now() - timedelta(hours=25)).timestamp()
+        recent_time = datetime.now().timestamp()
 
         cache.cache = {
             "AAPL": {"market_cap": 3000000000000, "timestamp": old_time},
@@ -182,7 +205,7 @@ class TestClearExpired:
         cache_file = tmp_path / "cache.json"
         cache = MarketCapCache(cache_file=str(cache_file), ttl_hours=24)
 
-        old_time = (datetime.now() - timedelta(hours=25)).isoformat()
+        old_time = (datetime.now() - timedelta(hours=25)).timestamp()
         cache.cache = {"AAPL": {"market_cap": 3000000000000, "timestamp": old_time}}
 
         cache.clear_expired()
@@ -195,7 +218,7 @@ class TestClearExpired:
         cache_file = tmp_path / "cache.json"
         cache = MarketCapCache(cache_file=str(cache_file), ttl_hours=24)
 
-        recent_time = datetime.now().isoformat()
+        recent_time = datetime.now().timestamp()
         cache.cache = {"AAPL": {"market_cap": 3000000000000, "timestamp": recent_time}}
         cache._save_cache()
 
@@ -225,8 +248,8 @@ class TestGetStats:
         cache_file = tmp_path / "cache.json"
         cache = MarketCapCache(cache_file=str(cache_file), ttl_hours=24)
 
-        old_time = (datetime.now() - timedelta(hours=25)).isoformat()
-        recent_time = datetime.now().isoformat()
+        old_time = (datetime.now() - timedelta(hours=25)).timestamp()
+        recent_time = datetime.now().timestamp()
 
         cache.cache = {
             "AAPL": {"market_cap": 3000000000000, "timestamp": old_time},
@@ -244,8 +267,8 @@ class TestGetStats:
         cache_file = tmp_path / "cache.json"
         cache = MarketCapCache(cache_file=str(cache_file), ttl_hours=48)
 
-        time_10h = (datetime.now() - timedelta(hours=10)).isoformat()
-        time_2h = (datetime.now() - timedelta(hours=2)).isoformat()
+        time_10h = (datetime.now() - timedelta(hours=10)).timestamp()
+        time_2h = (datetime.now() - timedelta(hours=2)).timestamp()
 
         cache.cache = {
             "AAPL": {"market_cap": 3000000000000, "timestamp": time_10h},
@@ -284,6 +307,16 @@ class TestSaveCache:
         # Data should still be in memory
         assert cache.cache["AAPL"]["market_cap"] == 3000000000000
 
+    def test_replaces_file_without_leftover_temp_file(self, tmp_path):
+        """Should write via a temp file that is swapped into place."""
+        cache_file = tmp_path / "cache.json"
+        cache = MarketCapCache(cache_file=str(cache_file))
+
+        cache.set("AAPL", 3000000000000)
+
+        assert json.loads(cache_file.read_text())["AAPL"]["market_cap"] == 3000000000000
+        assert not (tmp_path / "cache.json.tmp").exists()
+
 
 class TestCacheIntegration:
     """Integration tests for cache workflow."""
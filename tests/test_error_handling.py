@@ -2,11 +2,23 @@
 Test error handling and edge cases
 """
 
+import threading
+import time
 from unittest.mock import Mock, patch
 
+import numpy as np
+import pandas as pd
 import pytest
 
-from src.data_source_yfinance import daily_ohlc
+from src import data_source_yfinance as ds
+from src.data_source_yfinance import (
+    batch_4h_ohlc,
+    batch_daily_ohlc,
+    batch_quotes,
+    clear_ohlc_cache,
+    daily_ohlc,
+    hourly_4h_ohlc,
+)
 from src.exceptions import ConfigError, TelegramError
 from src.notion_client import NotionClient
 from src.telegram_client import TelegramClient
@@ -155,8 +167,6 @@ class TestDataSourceErrorHandling:
     @patch("yfinance.Ticker")
     def test_empty_data_response(self, mock_ticker):
         """Test empty data from yfinance"""
-        import pandas as pd
-
         mock_instance = Mock()
         mock_instance.history.return_value = pd.DataFrame()  # Empty
         mock_ticker.return_value = mock_instance
@@ -166,13 +176,191 @@ class TestDataSourceErrorHandling:
         # Should return None for empty data
         assert result is None
 
+    @patch("yfinance.download")
+    def test_batch_download_failure(self, mock_download):
+        """Test batch OHLC download failure returns no frames"""
+        mock_download.side_effect = Exception("Network error")
+
+        assert batch_daily_ohlc(["AAPL", "MSFT"]) == {}
+
+    @patch("yfinance.download")
+    def test_batch_download_splits_per_symbol(self, mock_download):
+        """Test batch OHLC download is sliced into one clean frame per symbol"""
+        dates = pd.date_range("2024-01-01", periods=40, freq="D", name="Date")
+        fields = ["Open", "High", "Low", "Close", "Volume"]
+        columns = pd.MultiIndex.from_product([["AAPL", "MSFT"], fields])
+        data = pd.DataFrame(np.random.rand(40, 10) + 1, index=dates, columns=columns)
+        data.loc[:, ("MSFT", "Close")] = np.nan  # MSFT has no usable rows
+        mock_download.return_value = data
+
+        frames = batch_daily_ohlc(["AAPL", "MSFT", "NVDA"], days=30)
+
+        assert list(frames) == ["AAPL"]
+        assert list(frames["AAPL"].columns) == ["Date", *fields]
+        assert len(frames["AAPL"]) == 30
+
+    @patch("yfinance.download")
+    def test_batch_download_single_symbol_flat_columns(self, mock_download):
+        """Test a one-symbol batch still yields a frame when yfinance returns flat columns"""
+        dates = pd.date_range("2024-01-01", periods=40, freq="D", name="Date")
+        fields = ["Open", "High", "Low", "Close", "Volume"]
+        mock_download.return_value = pd.DataFrame(np.random.rand(40, 5) + 1, index=dates, columns=fields)
+
+        frames = batch_daily_ohlc(["AAPL", "MSFT", "NVDA"], days=30, batch_size=2)
+
+        # Second batch holds only NVDA and comes back flat
+        assert "NVDA" in frames
+        assert list(frames["NVDA"].columns) == ["Date", *fields]
+        assert len(frames["NVDA"]) == 30
+        assert "AAPL" not in frames and "MSFT" not in frames
+
+    @patch("yfinance.Ticker")
+    @patch("yfinance.download")
+    def test_batch_4h_download_seeds_cache(self, mock_download, mock_ticker):
+        """Test batched 1h bars are resampled to 4h and reused by hourly_4h_ohlc"""
+        hours = pd.date_range("2024-01-01", periods=200, freq="h", name="Datetime")
+        fields = ["Open", "High", "Low", "Close", "Volume"]
+        columns = pd.MultiIndex.from_product([["AAPL"], fields])
+        mock_download.return_value = pd.DataFrame(np.random.rand(200, 5) + 1, index=hours, columns=columns)
+
+        frames = batch_4h_ohlc(["AAPL"])
+
+        assert list(frames["AAPL"].columns) == ["Date", *fields]
+        assert len(frames["AAPL"]) == 50
+        assert hourly_4h_ohlc("AAPL") is frames["AAPL"]
+        mock_ticker.assert_not_called()
+
+    @patch("yfinance.Ticker")
+    @patch("yfinance.download")
+    def test_batch_4h_matches_per_ticker_path_for_utc_bars(self, mock_download, mock_ticker):
+        """Test UTC bars from yf.download resample to the same 4h bars as exchange-time history()"""
+        hours = pd.date_range("2024-01-02 09:30", periods=200, freq="h", tz="America/New_York", name="Datetime")
+        fields = ["Open", "High", "Low", "Close", "Volume"]
+        history = pd.DataFrame(np.random.rand(200, 5) + 1, index=hours, columns=fields)
+        mock_ticker.return_value.history.return_value = history
+        expected = hourly_4h_ohlc("AAPL")
+        clear_ohlc_cache()
+
+        utc = history.tz_convert("UTC")
+        utc.columns = pd.MultiIndex.from_product([["AAPL"], fields])
+        mock_download.return_value = utc
+        frames = batch_4h_ohlc(["AAPL"])
+
+        pd.testing.assert_frame_equal(frames["AAPL"], expected)
+
+
+class TestOhlcCache:
+    """Test the in-memory OHLC cache and request coalescing"""
+
+    def test_cache_insert_evicts_expired_entries(self):
+        """Test storing a frame drops entries past the TTL even if their keys are never looked up again"""
+        with patch("src.data_source_yfinance.time.monotonic", return_value=1000.0):
+            ds._put_cached_ohlc(("1d", "AAPL", 17), pd.DataFrame())
+        with patch("src.data_source_yfinance.time.monotonic", return_value=1000.0 + ds.OHLC_CACHE_TTL_SECONDS + 1):
+            ds._put_cached_ohlc(("1d", "AAPL", 18), pd.DataFrame())
+
+        assert list(ds._ohlc_cache) == [("1d", "AAPL", 18)]
+
+    def test_cache_size_is_capped(self):
+        """Test the oldest frames are evicted once the cache exceeds its size limit"""
+        with patch("src.data_source_yfinance.OHLC_CACHE_SIZE", 2):
+            for days in (10, 11, 12):
+                ds._put_cached_ohlc(("1d", "AAPL", days), pd.DataFrame())
+
+        assert list(ds._ohlc_cache) == [("1d", "AAPL", 11), ("1d", "AAPL", 12)]
+
+    @patch("yfinance.Ticker")
+    def test_repeated_fetch_served_from_cache(self, mock_ticker):
+        """Test repeated daily_ohlc calls within the TTL reuse the first response"""
+        dates = pd.date_range("2024-01-01", periods=40, freq="D", name="Date")
+        history = pd.DataFrame(
+            np.random.rand(40, 5) + 1, index=dates, columns=["Open", "High", "Low", "Close", "Volume"]
+        )
+        mock_ticker.return_value.history.return_value = history
+
+        first = daily_ohlc("AAPL")
+        second = daily_ohlc("AAPL")
+
+        assert first is second
+        assert mock_ticker.return_value.history.call_count == 1
+
+    @patch("yfinance.Ticker")
+    def test_concurrent_fetches_are_coalesced(self, mock_ticker):
+        """Test concurrent daily_ohlc calls for one symbol share a single request"""
+        dates = pd.date_range("2024-01-01", periods=40, freq="D", name="Date")
+        history = pd.DataFrame(
+            np.random.rand(40, 5) + 1, index=dates, columns=["Open", "High", "Low", "Close", "Volume"]
+        )
+
+        def slow_history(**kwargs):
+            time.sleep(0.2)
+            return history
+
+        mock_ticker.return_value.history.side_effect = slow_history
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(daily_ohlc("AAPL"))) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len(results) == 4
+        assert all(r is results[0] for r in results)
+        assert mock_ticker.return_value.history.call_count == 1
+
+
+class TestBatchQuotes:
+    """Test batched quote requests through yfinance's shared YfData session"""
+
+    @patch("src.data_source_yfinance.rate_limit")
+    @patch("src.data_source_yfinance.YfData")
+    def test_symbols_split_into_batches(self, mock_yfdata, mock_rate_limit):
+        """Test symbols are chunked by batch_size and joined into the symbols parameter"""
+        get_raw_json = mock_yfdata.return_value.get_raw_json
+        get_raw_json.side_effect = lambda url, params: {
+            "quoteResponse": {"result": [{"symbol": s, "marketCap": 1} for s in params["symbols"].split(",")]}
+        }
+
+        quotes = batch_quotes(["AAPL", "MSFT", "NVDA"], batch_size=2)
+
+        assert [c.kwargs["params"]["symbols"] for c in get_raw_json.call_args_list] == ["AAPL,MSFT", "NVDA"]
+        assert all(c.kwargs["params"]["formatted"] == "false" for c in get_raw_json.call_args_list)
+        assert quotes == {s: {"symbol": s, "marketCap": 1} for s in ["AAPL", "MSFT", "NVDA"]}
+
+    @patch("src.data_source_yfinance.rate_limit")
+    @patch("src.data_source_yfinance.YfData")
+    def test_skips_quotes_without_symbol_and_empty_results(self, mock_yfdata, mock_rate_limit):
+        """Test quotes missing a symbol and batches with an empty or null result are skipped"""
+        mock_yfdata.return_value.get_raw_json.side_effect = [
+            {"quoteResponse": {"result": [{"marketCap": 5}, {"symbol": "AAPL", "marketCap": 3}]}},
+            {"quoteResponse": {"result": []}},
+            {"quoteResponse": {"result": None}},
+        ]
+
+        quotes = batch_quotes(["AAPL", "X1", "X2"], batch_size=1)
+
+        assert quotes == {"AAPL": {"symbol": "AAPL", "marketCap": 3}}
+
+    @patch("src.data_source_yfinance.rate_limit")
+    @patch("src.data_source_yfinance.YfData")
+    def test_failed_batch_drops_only_its_symbols(self, mock_yfdata, mock_rate_limit):
+        """Test an exception in one batch loses that batch's symbols but keeps the others"""
+        mock_yfdata.return_value.get_raw_json.side_effect = [
+            Exception("Network error"),
+            {"quoteResponse": {"result": [{"symbol": "NVDA", "marketCap": 2}]}},
+        ]
+
+        quotes = batch_quotes(["AAPL", "MSFT", "NVDA"], batch_size=2)
+
+        assert quotes == {"NVDA": {"symbol": "NVDA", "marketCap": 2}}
+
 
 class TestConfigValidation:
     """Test configuration validation"""
 
     def test_missing_required_fields(self):
         """Test config with missing fields"""
-
         from src.config import Config
 
         # Create invalid config
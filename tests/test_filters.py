@@ -11,6 +11,7 @@ from src.filters import (
     check_signal_criteria,
     check_wavetrend_signal,
     get_wavetrend_values,
+    prefetch_market_caps,
 )
 
 
@@ -260,3 +261,30 @@ class TestGetWavetrendValues:
 
         assert result is not None
         assert "weekly_wt1" in result
+
+
+class TestPrefetchMarketCaps:
+    """Tests for prefetch_market_caps function."""
+
+    def test_fetches_only_uncached_symbols(self):
+        """Should request quotes only for symbols missing from the cache."""
+        cache = Mock()
+        cache.get.side_effect = lambda s: 1e12 if s == "AAPL" else None
+
+        quotes = {"MSFT": {"marketCap": 3e12}, "XYZ": {"marketCap": None}}
+        with patch("src.filters.batch_quotes", return_value=quotes) as mock_quotes:
+            cached = prefetch_market_caps(["AAPL", "MSFT", "XYZ"], cache)
+
+        mock_quotes.assert_called_once_with(["MSFT", "XYZ"])
+        cache.set_many.assert_called_once_with({"MSFT": 3e12})
+        assert cached == 1
+
+    def test_skips_request_when_all_cached(self):
+        """Should not hit the network when every symbol is cached."""
+        cache = Mock()
+        cache.get.return_value = 1e12
+
+        with patch("src.filters.batch_quotes") as mock_quotes:
+            assert prefetch_market_caps(["AAPL"], cache) == 0
+
+        mock_quotes.assert_not_called()
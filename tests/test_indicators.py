@@ -7,7 +7,16 @@ import numpy as np
 import pandas as pd
 import pytest
 
-from src.indicators import mfi, mfi_uptrend, rsi, stoch_rsi_buy, stochastic_rsi, wavetrend, wavetrend_buy
+from src.indicators import (
+    invalidate,
+    mfi,
+    mfi_uptrend,
+    rsi,
+    stoch_rsi_buy,
+    stochastic_rsi,
+    wavetrend,
+    wavetrend_buy,
+)
 
 
 class TestRSI:
@@ -272,6 +281,18 @@ class TestWaveTrendBuy:
         # Should not signal (not oversold)
         assert not result
 
+    def test_cross_outside_lookback_ignored(self):
+        """Test crosses older than the lookback window and NaN bars do not signal"""
+        wt_df = pd.DataFrame(
+            {
+                "wt1": [-60, -50, -45, np.nan, -40, -38],  # Crossed at index 1, then stays above
+                "wt2": [-58, -56, -52, -50, -48, -46],
+            }
+        )
+
+        assert wavetrend_buy(wt_df, lookback_days=5, oversold_level=-53)
+        assert not wavetrend_buy(wt_df, lookback_days=3, oversold_level=-53)
+
 
 class TestEdgeCases:
     """Test edge cases and error handling"""
@@ -306,5 +327,50 @@ class TestEdgeCases:
         assert result is not None
 
 
+class TestMemoization:
+    """Test per-symbol memoization of indicator results"""
+
+    def _ohlc(self, n=60):
+        close = pd.Series(100 + np.sin(np.arange(n) / 3) * 5)
+        return pd.DataFrame({"High": close + 1, "Low": close - 1, "Close": close, "Volume": 1_000_000})
+
+    def test_same_bars_reuse_result(self):
+        """Test unchanged data for a symbol returns the cached result"""
+        df = self._ohlc()
+
+        first = wavetrend(df, symbol="AAPL")
+        second = wavetrend(df.copy(), symbol="AAPL")
+
+        assert first is second
+
+    def test_updated_last_bar_recomputes(self):
+        """Test an intraday change to the last bar invalidates the cached result"""
+        df = self._ohlc()
+        first = mfi(df, symbol="AAPL")
+
+        updated = df.copy()
+        updated.loc[updated.index[-1], "Close"] += 3
+        second = mfi(updated, symbol="AAPL")
+
+        assert first is not second
+
+    def test_no_symbol_is_not_cached(self):
+        """Test calls without a symbol always recompute"""
+        close = self._ohlc()["Close"]
+
+        assert stochastic_rsi(close) is not stochastic_rsi(close)
+
+    def test_invalidate_symbol(self):
+        """Test invalidate drops only the given symbol"""
+        df = self._ohlc()
+        aapl = wavetrend(df, symbol="AAPL")
+        msft = wavetrend(df, symbol="MSFT")
+
+        invalidate("AAPL")
+
+        assert wavetrend(df, symbol="AAPL") is not aapl
+        assert wavetrend(df, symbol="MSFT") is msft
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
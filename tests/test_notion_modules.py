@@ -255,6 +255,46 @@ class TestNotionRepository:
         assert symbols == []
         assert mapping == {}
 
+    @responses.activate
+    def test_get_signals_set_upper_cases_symbols(self, repo):
+        """Test signals set is built from one query and normalized for membership checks."""
+        responses.add(
+            responses.POST,
+            "https://api.notion.com/v1/databases/test_signals_db/query",
+            json={
+                "results": [
+                    {
+                        "id": "page1",
+                        "properties": {"Symbol": {"type": "title", "title": [{"text": {"content": "aapl"}}]}},
+                    }
+                ]
+            },
+            status=200,
+        )
+
+        assert repo.get_signals_set() == {"AAPL"}
+        assert len(responses.calls) == 1
+
+    @responses.activate
+    def test_symbol_exists_in_signals_is_case_insensitive(self, repo):
+        """Test existence check matches regardless of case via the signals set."""
+        responses.add(
+            responses.POST,
+            "https://api.notion.com/v1/databases/test_signals_db/query",
+            json={
+                "results": [
+                    {
+                        "id": "page1",
+                        "properties": {"Symbol": {"type": "title", "title": [{"text": {"content": "aapl"}}]}},
+                    }
+                ]
+            },
+            status=200,
+        )
+
+        assert repo.symbol_exists_in_signals("AAPL") is True
+        assert repo.symbol_exists_in_signals("MSFT") is False
+
     @responses.activate
     def test_get_signals_network_error_returns_empty(self, repo):
         """Test that network errors return empty results gracefully."""
@@ -2,6 +2,7 @@
 
 import threading
 import time
+from unittest.mock import patch
 
 from src.rate_limiter import RateLimiter, get_rate_limiter, rate_limit
 
@@ -35,6 +36,47 @@ class TestRateLimiter:
         # In real test we'd mock time, but for simplicity just check it waited
         assert elapsed >= 0  # Minimal check
 
+    def test_waits_only_for_missing_tokens(self):
+        """Should sleep just long enough to refill one token, not the whole window"""
+        limiter = RateLimiter(custom_limits={"test": 120})  # refills 2 tokens/second
+
+        for _ in range(120):
+            limiter.wait("test")
+
+        wait_time = limiter.wait("test")
+
+        assert 0 < wait_time < 2.0
+
+    def test_concurrent_waiters_do_not_overdraw(self):
+        """Threads woken together should not consume more tokens than were refilled"""
+        limiter = RateLimiter(custom_limits={"test": 240})  # refills 4 tokens/second
+
+        for _ in range(240):
+            limiter.wait("test")
+
+        threads = [threading.Thread(target=limiter.wait, args=("test",)) for _ in range(3)]
+        start = time.monotonic()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        # Three tokens at 4/s cannot be earned in much under 0.75s
+        assert time.monotonic() - start >= 0.7
+        assert limiter._buckets["test"]["tokens"] >= 0
+
+    def test_tokens_refill_over_time(self):
+        """Tokens should refill continuously rather than at a window boundary"""
+        limiter = RateLimiter(custom_limits={"test": 60})
+
+        with patch("src.rate_limiter.time.monotonic", return_value=1000.0):
+            for _ in range(60):
+                limiter.wait("test")
+            assert limiter.get_remaining("test") == 0
+
+        with patch("src.rate_limiter.time.monotonic", return_value=1010.0):
+            assert limiter.get_remaining("test") == 10
+
     def test_get_remaining(self):
         """Should correctly report remaining requests"""
         limiter = RateLimiter(custom_limits={"test": 10})
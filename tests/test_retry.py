@@ -130,6 +130,21 @@ class TestRetryWithBackoff:
         # Check there's some variation (jitter is ±25%)
         assert len({round(d, 2) for d in first_attempt_delays}) > 1
 
+    def test_jitter_stays_within_bounds(self):
+        """Test that jittered delays stay within ±25% of the base schedule"""
+
+        @retry_with_backoff(max_attempts=4, base_delay=1.0, max_delay=100.0, jitter=True)
+        def always_fails():
+            raise ValueError("Fail")
+
+        with patch("src.retry.time.sleep") as mock_sleep:
+            with pytest.raises(RetryError):
+                always_fails()
+
+        calls = [call[0][0] for call in mock_sleep.call_args_list]
+        for delay, expected in zip(calls, [1.0, 2.0, 4.0], strict=True):
+            assert expected * 0.75 <= delay <= expected * 1.25
+
     def test_on_retry_callback_called(self):
         """Test that on_retry callback is called before each retry"""
         callback_calls = []
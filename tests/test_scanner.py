@@ -1,11 +1,12 @@
 """Tests for scanner module."""
 
-from datetime import datetime
-from unittest.mock import Mock, patch
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, Mock, patch
 
 import pytest
 
 from src.scanner import (
+    _flush_notion_writes,
     run_continuous,
     run_market_scan,
     run_wavetrend_scan,
@@ -47,6 +48,84 @@ class TestUpdateSignalPerformance:
 
         assert result["updated"] == 0
 
+    def test_batches_price_download_for_old_signals(self):
+        """Should download prices once for all pending signals, not per signal."""
+        old = (datetime.now() - timedelta(days=10)).isoformat()
+        mock_tracker = MagicMock()
+        mock_tracker.data = {
+            "signal_history": [
+                {"symbol": "AAPL", "date": old, "data": {"price": 150.0}},
+                {"symbol": "MSFT", "date": old, "data": {"price": 300.0}},
+            ]
+        }
+        mock_tracker.get_all_stats.side_effect = [{"evaluated": 0}, {"evaluated": 1}]
+        aapl = Mock()
+
+        with patch("src.scanner.batch_daily_ohlc", return_value={"AAPL": aapl}) as mock_batch:
+            result = update_signal_performance(mock_tracker, lookback_days=7)
+
+        mock_batch.assert_called_once_with(["AAPL", "MSFT"], days=20)
+        mock_tracker.update_signal_performance.assert_called_once_with("AAPL", 7, df=aapl)
+        mock_tracker.deferred_save.assert_called_once()
+        assert result == {"updated": 1, "failed": 1}  # MSFT got no frame
+
+    def test_buckets_download_span_per_symbol(self):
+        """Should size each symbol's download by its own oldest signal, not the oldest overall."""
+        mock_tracker = MagicMock()
+        mock_tracker.data = {
+            "signal_history": [
+                {"symbol": "AAPL", "date": (datetime.now() - timedelta(days=10)).isoformat(), "data": {"price": 1.0}},
+                {"symbol": "MSFT", "date": (datetime.now() - timedelta(days=45)).isoformat(), "data": {"price": 1.0}},
+            ]
+        }
+        mock_tracker.get_all_stats.return_value = {"evaluated": 0}
+
+        with patch("src.scanner.batch_daily_ohlc", return_value={}) as mock_batch:
+            update_signal_performance(mock_tracker, lookback_days=7)
+
+        assert [c.args[0] for c in mock_batch.call_args_list] == [["AAPL"], ["MSFT"]]
+        assert [c.kwargs["days"] for c in mock_batch.call_args_list] == [20, 60]
+
+    def test_flags_unevaluable_signals_instead_of_retrying(self, tmp_path):
+        """Should flag zero-price and too-old signals as failed once, then leave them out of the fetch."""
+        from src.signal_tracker import SignalTracker
+
+        tracker = SignalTracker(data_file=str(tmp_path / "signals.json"))
+        tracker.data["signal_history"] = [
+            {"symbol": "AAPL", "date": (datetime.now() - timedelta(days=10)).isoformat(), "data": {"price": 0}},
+            {"symbol": "GONE", "date": (datetime.now() - timedelta(days=400)).isoformat(), "data": {"price": 5.0}},
+        ]
+
+        with patch("src.scanner.batch_daily_ohlc", return_value={}) as mock_batch:
+            first = update_signal_performance(tracker, lookback_days=7)
+            second = update_signal_performance(tracker, lookback_days=7)
+
+        assert first == {"updated": 0, "failed": 2}
+        assert second == {"updated": 0, "failed": 0}
+        mock_batch.assert_not_called()
+        assert [s["unevaluable"] for s in tracker.data["signal_history"]] == ["no_entry_price", "too_old"]
+
+    def test_counts_signals_not_symbols(self, tmp_path):
+        """Should report evaluated signals, so one symbol with three old signals counts three."""
+        import numpy as np
+        import pandas as pd
+
+        from src.signal_tracker import SignalTracker
+
+        tracker = SignalTracker(data_file=str(tmp_path / "signals.json"))
+        start = datetime.now() - timedelta(days=30)
+        tracker.data["signal_history"] = [
+            {"symbol": "AAPL", "date": (start + timedelta(days=d)).isoformat(), "data": {"price": 100.0}}
+            for d in (0, 2, 4)
+        ] + [{"symbol": "MSFT", "date": datetime.now().isoformat(), "data": {"price": 300.0}}]
+        dates = pd.date_range(start.date(), periods=31, freq="D")
+        df = pd.DataFrame({"Date": dates, "Close": np.linspace(100.0, 130.0, 31)})
+
+        with patch("src.scanner.batch_daily_ohlc", return_value={"AAPL": df}):
+            result = update_signal_performance(tracker, lookback_days=7)
+
+        assert result == {"updated": 3, "failed": 0}
+
 
 class TestRunMarketScan:
     """Tests for run_market_scan function."""
@@ -66,15 +145,17 @@ class TestRunMarketScan:
     def test_returns_dict_on_success(self, mock_config):
         """Should return dict with scan statistics."""
         with (
-            patch("src.scanner.MarketCapCache") as mock_cache,
+            patch("src.scanner.get_market_cap_cache") as mock_cache,
             patch("src.scanner.NotionClient") as mock_notion,
             patch("src.scanner.get_sp500_symbols", return_value=["AAPL", "MSFT"]),
+            patch("src.scanner.batch_daily_ohlc", return_value={}),
             patch("src.scanner.check_market_filter", return_value=None),
-            patch("src.scanner.SignalTracker"),
-            patch("src.scanner.Analytics"),
-            patch("src.scanner.NotionBackup") as mock_backup,
+            patch("src.scanner.get_signal_tracker"),
+            patch("src.scanner.get_analytics"),
+            patch("src.scanner.get_backup") as mock_backup,
         ):
-            mock_notion.return_value.get_all_symbols.return_value = []
+            mock_notion.return_value.get_signals_set.return_value = set()
+            mock_notion.return_value.get_buy_set.return_value = set()
             mock_cache.return_value.get_stats.return_value = {"valid_entries": 0}
             mock_backup.return_value.cleanup_old_backups.return_value = 0
             mock_backup.return_value.get_backup_stats.return_value = {"total_backups": 0, "total_size_mb": 0}
@@ -88,16 +169,18 @@ class TestRunMarketScan:
     def test_skips_existing_symbols(self, mock_config):
         """Should skip symbols already in signals/buy database."""
         with (
-            patch("src.scanner.MarketCapCache") as mock_cache,
+            patch("src.scanner.get_market_cap_cache") as mock_cache,
             patch("src.scanner.NotionClient") as mock_notion,
             patch("src.scanner.get_sp500_symbols", return_value=["AAPL", "MSFT"]),
+            patch("src.scanner.batch_daily_ohlc", return_value={}),
             patch("src.scanner.check_market_filter") as mock_filter,
-            patch("src.scanner.SignalTracker"),
-            patch("src.scanner.Analytics"),
-            patch("src.scanner.NotionBackup") as mock_backup,
+            patch("src.scanner.get_signal_tracker"),
+            patch("src.scanner.get_analytics"),
+            patch("src.scanner.get_backup") as mock_backup,
         ):
             # AAPL already exists
-            mock_notion.return_value.get_all_symbols.return_value = ["AAPL"]
+            mock_notion.return_value.get_signals_set.return_value = {"AAPL"}
+            mock_notion.return_value.get_buy_set.return_value = set()
             mock_cache.return_value.get_stats.return_value = {"valid_entries": 0}
             mock_backup.return_value.cleanup_old_backups.return_value = 0
             mock_backup.return_value.get_backup_stats.return_value = {"total_backups": 0, "total_size_mb": 0}
@@ -108,6 +191,42 @@ class TestRunMarketScan:
         # AAPL should be skipped, MSFT should be checked
         assert result["skipped"] == 1
 
+    def test_adds_only_signal_symbols_to_notion(self, mock_config):
+        """Should write symbols whose concurrent scan found a signal, serially, in list order."""
+        market = {"market_cap": 1e12, "stoch_d": 10.0, "stoch_k": 12.0, "price": 100.0, "bb_lower": 101.0, "mfi": 30.0}
+        scans = {
+            "AAPL": {"result": market, "signal": True},
+            "MSFT": None,
+            "NVDA": {"result": market, "signal": False},
+            "TSLA": {"result": market, "signal": True},
+        }
+
+        with (
+            patch("src.scanner.get_market_cap_cache") as mock_cache,
+            patch("src.scanner.NotionClient") as mock_notion,
+            patch("src.scanner.get_sp500_symbols", return_value=list(scans)),
+            patch("src.scanner.batch_daily_ohlc", return_value={}),
+            patch("src.scanner._scan_symbol", side_effect=lambda symbol, cache, df: scans[symbol]),
+            patch("src.scanner.get_signal_tracker"),
+            patch("src.scanner.get_analytics"),
+            patch("src.scanner.get_backup") as mock_backup,
+        ):
+            notion = mock_notion.return_value
+            notion.get_signals_set.return_value = set()
+            notion.get_buy_set.return_value = set()
+            notion.add_to_signals.return_value = True
+            mock_cache.return_value.get_stats.return_value = {"valid_entries": 0}
+            mock_backup.return_value.cleanup_old_backups.return_value = 0
+            mock_backup.return_value.get_backup_stats.return_value = {"total_backups": 0, "total_size_mb": 0}
+
+            result = run_market_scan(mock_config)
+
+        assert result["filter_passed"] == 3
+        assert result["signals_found"] == 2
+        assert result["added"] == 2
+        assert [c.args[0] for c in notion.add_to_signals.call_args_list] == ["AAPL", "TSLA"]
+        notion.symbol_exists_in_signals.assert_not_called()
+
 
 class TestRunWavetrendScan:
     """Tests for run_wavetrend_scan function."""
@@ -129,7 +248,7 @@ class TestRunWavetrendScan:
         with (
             patch("src.scanner.NotionClient") as mock_notion,
             patch("src.scanner.TelegramClient"),
-            patch("src.scanner.SignalTracker") as mock_tracker,
+            patch("src.scanner.get_signal_tracker") as mock_tracker,
         ):
             mock_notion.return_value.cleanup_old_signals.return_value = 0
             mock_notion.return_value.cleanup_old_buys.return_value = 0
@@ -147,20 +266,96 @@ class TestRunWavetrendScan:
         with (
             patch("src.scanner.NotionClient") as mock_notion,
             patch("src.scanner.TelegramClient"),
-            patch("src.scanner.SignalTracker") as mock_tracker,
+            patch("src.scanner.get_signal_tracker") as mock_tracker,
             patch("src.scanner.check_wavetrend_signal") as mock_wt,
-            patch("src.scanner.Analytics"),
+            patch("src.scanner.batch_4h_ohlc") as mock_batch_4h,
+            patch("src.scanner.batch_daily_ohlc"),
+            patch("src.scanner.get_analytics"),
         ):
             mock_notion.return_value.cleanup_old_signals.return_value = 0
             mock_notion.return_value.cleanup_old_buys.return_value = 0
             mock_notion.return_value.get_signals.return_value = (["AAPL", "MSFT"], {"AAPL": "page1", "MSFT": "page2"})
-            mock_notion.return_value._get_symbols_from_database.return_value = ["AAPL"]  # Already in buy
+            mock_notion.return_value.get_buy_set.return_value = {"AAPL"}  # Already in buy
             mock_tracker.return_value.get_daily_stats.return_value = {"alerts_sent": 0, "symbols_in_cooldown": 0}
             mock_wt.return_value = False
 
             result = run_wavetrend_scan(mock_config)
 
         assert result["skipped"] == 1
+        mock_batch_4h.assert_called_once_with(["MSFT"])
+
+    def test_blocked_alert_queues_notion_writes(self, mock_config):
+        """Should move blocked-alert symbols to buy via writes flushed after the loop."""
+        with (
+            patch("src.scanner.NotionClient") as mock_notion,
+            patch("src.scanner.TelegramClient"),
+            patch("src.scanner.get_signal_tracker") as mock_tracker,
+            patch("src.scanner.check_wavetrend_signal", return_value=True),
+            patch("src.scanner.batch_4h_ohlc"),
+            patch("src.scanner.batch_daily_ohlc"),
+            patch("src.scanner.get_analytics"),
+        ):
+            notion = mock_notion.return_value
+            notion.cleanup_old_signals.return_value = 0
+            notion.cleanup_old_buys.return_value = 0
+            notion.get_signals.return_value = (["AAPL", "MSFT"], {"AAPL": "page1", "MSFT": "page2"})
+            notion.get_buy_set.return_value = set()
+            notion.delete_page.return_value = True
+            notion.add_to_buy.return_value = True
+            mock_tracker.return_value.get_daily_stats.return_value = {"alerts_sent": 5, "symbols_in_cooldown": 0}
+            mock_tracker.return_value.can_send_alert.return_value = (False, "daily_limit")
+
+            result = run_wavetrend_scan(mock_config)
+
+        assert result["confirmed"] == 2
+        assert sorted(c.args[0] for c in notion.delete_page.call_args_list) == ["page1", "page2"]
+        assert sorted(c.args[0] for c in notion.add_to_buy.call_args_list) == ["AAPL", "MSFT"]
+
+    def test_queued_writes_flushed_when_later_symbol_raises(self, mock_config):
+        """Should still apply queued Notion writes if the loop aborts on a later symbol."""
+        with (
+            patch("src.scanner.NotionClient") as mock_notion,
+            patch("src.scanner.TelegramClient"),
+            patch("src.scanner.get_signal_tracker") as mock_tracker,
+            patch("src.scanner.check_wavetrend_signal", side_effect=[True, RuntimeError("boom")]),
+            patch("src.scanner.batch_4h_ohlc"),
+            patch("src.scanner.batch_daily_ohlc"),
+            patch("src.scanner.get_analytics"),
+        ):
+            notion = mock_notion.return_value
+            notion.cleanup_old_signals.return_value = 0
+            notion.cleanup_old_buys.return_value = 0
+            notion.get_signals.return_value = (["AAPL", "MSFT"], {"AAPL": "page1", "MSFT": "page2"})
+            notion.get_buy_set.return_value = set()
+            notion.delete_page.return_value = True
+            notion.add_to_buy.return_value = True
+            mock_tracker.return_value.get_daily_stats.return_value = {"alerts_sent": 5, "symbols_in_cooldown": 0}
+            mock_tracker.return_value.can_send_alert.return_value = (False, "daily_limit")
+
+            with pytest.raises(RuntimeError):
+                run_wavetrend_scan(mock_config)
+
+        notion.delete_page.assert_called_once_with("page1")
+        assert notion.add_to_buy.call_args_list[0].args[0] == "AAPL"
+        assert notion.add_to_buy.call_count == 1
+
+
+class TestFlushNotionWrites:
+    """Tests for _flush_notion_writes helper."""
+
+    def test_returns_results_in_call_order(self):
+        """Should report one success flag per call, failures as False."""
+
+        def write(symbol):
+            if symbol == "BAD":
+                raise RuntimeError("boom")
+            return symbol != "NOPE"
+
+        assert _flush_notion_writes(write, [("AAPL",), ("BAD",), ("NOPE",), ("MSFT",)]) == [True, False, False, True]
+
+    def test_empty_queue(self):
+        """Should not start workers for an empty queue."""
+        assert _flush_notion_writes(Mock(), []) == []
 
 
 class TestRunContinuous:
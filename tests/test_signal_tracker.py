@@ -6,7 +6,7 @@ from unittest.mock import patch
 
 import pandas as pd
 
-from src.signal_tracker import SignalTracker
+from src.signal_tracker import SignalTracker, _today_iso
 
 
 class TestSignalTrackerInit:
@@ -34,6 +34,23 @@ class TestSignalTrackerInit:
         assert tracker.data["daily_alerts"] == {"2024-01-01": 3}
         assert "AAPL" in tracker.data["symbol_cooldown"]
 
+    def test_migrates_iso_cooldowns_to_timestamps(self, tmp_path):
+        """Should convert legacy ISO-string cooldowns to epoch seconds on load."""
+        data_file = tmp_path / "signals.json"
+        existing_data = {
+            "daily_alerts": {},
+            "symbol_cooldown": {"AAPL": "2024-01-01T10:00:00", "MSFT": 1704103200.0},
+            "signal_history": [],
+        }
+        data_file.write_text(json.dumps(existing_data))
+
+        tracker = SignalTracker(data_file=str(data_file))
+
+        assert tracker.data["symbol_cooldown"] == {
+            "AAPL": datetime(2024, 1, 1, 10, 0).timestamp(),
+            "MSFT": 1704103200.0,
+        }
+
     def test_handles_corrupted_json_file(self, tmp_path):
         """Should return default data when JSON is corrupted."""
         data_file = tmp_path / "signals.json"
@@ -76,7 +93,7 @@ class TestCanSendAlert:
         tracker = SignalTracker(data_file=str(data_file))
 
         # Set cooldown 3 days ago
-        three_days_ago = (datetime.now() - timedelta(days=3)).isoformat()
+        three_days_ago = (datetime.now() - timedelta(days=3)).timestamp()
         tracker.data["symbol_cooldown"]["AAPL"] = three_days_ago
 
         can_send, reason = tracker.can_send_alert("AAPL", cooldown_days=7)
@@ -90,7 +107,7 @@ class TestCanSendAlert:
         tracker = SignalTracker(data_file=str(data_file))
 
         # Set cooldown 8 days ago
-        eight_days_ago = (datetime.now() - timedelta(days=8)).isoformat()
+        eight_days_ago = (datetime.now() - timedelta(days=8)).timestamp()
         tracker.data["symbol_cooldown"]["AAPL"] = eight_days_ago
 
         can_send, reason = tracker.can_send_alert("AAPL", cooldown_days=7)
@@ -115,6 +132,19 @@ class TestCanSendAlert:
         assert can_send is True
 
 
+class TestTodayIso:
+    """Tests for the cached local-date helper."""
+
+    def test_rolls_over_at_local_midnight(self):
+        """Should return each timestamp's local date, including across midnight."""
+        midnight = datetime(2024, 3, 15)
+
+        assert _today_iso((midnight - timedelta(seconds=1)).timestamp()) == "2024-03-14"
+        assert _today_iso(midnight.timestamp()) == "2024-03-15"
+        assert _today_iso((midnight + timedelta(hours=23)).timestamp()) == "2024-03-15"
+        assert _today_iso((midnight - timedelta(hours=1)).timestamp()) == "2024-03-14"
+
+
 class TestRecordAlert:
     """Tests for record_alert method."""
 
@@ -173,6 +203,19 @@ class TestRecordAlert:
         # Old entry should be removed
         assert old_date not in tracker.data["daily_alerts"]
 
+    def test_prunes_daily_alerts_once_per_day(self, tmp_path):
+        """Should only rebuild daily_alerts on the first alert of a new day."""
+        data_file = tmp_path / "signals.json"
+        tracker = SignalTracker(data_file=str(data_file))
+
+        tracker.record_alert("AAPL", {"price": 150.0})
+        pruned = tracker.data["daily_alerts"]
+
+        tracker.record_alert("MSFT", {"price": 300.0})
+
+        assert tracker.data["daily_alerts"] is pruned
+        assert sum(pruned.values()) == 2
+
 
 class TestGetDailyStats:
     """Tests for get_daily_stats method."""
@@ -186,7 +229,7 @@ class TestGetDailyStats:
         tracker.data["daily_alerts"][today] = 3
 
         # Add some signals in cooldown
-        now = datetime.now().isoformat()
+        now = datetime.now().timestamp()
         tracker.data["symbol_cooldown"] = {"AAPL": now, "GOOGL": now}
         tracker.data["signal_history"] = [{"symbol": "AAPL"}, {"symbol": "GOOGL"}, {"symbol": "MSFT"}]
 
@@ -225,7 +268,7 @@ class TestGetSymbolCooldownStatus:
         data_file = tmp_path / "signals.json"
         tracker = SignalTracker(data_file=str(data_file))
 
-        three_days_ago = (datetime.now() - timedelta(days=3)).isoformat()
+        three_days_ago = (datetime.now() - timedelta(days=3)).timestamp()
         tracker.data["symbol_cooldown"]["AAPL"] = three_days_ago
 
         status = tracker.get_symbol_cooldown_status("AAPL")
@@ -265,6 +308,28 @@ class TestGetSignalStats:
         assert stats["total_signals"] == 2
         assert stats["evaluated"] == 2
 
+    def test_symbol_stats_aggregate_returns(self, tmp_path):
+        """Per-symbol stats should aggregate only that symbol's returns as plain floats."""
+        data_file = tmp_path / "signals.json"
+        tracker = SignalTracker(data_file=str(data_file))
+
+        tracker.data["signal_history"] = [
+            {"symbol": "AAPL", "performance": {"return_pct": 6.0}},
+            {"symbol": "AAPL", "performance": {"return_pct": -2.0}},
+            {"symbol": "AAPL"},
+            {"symbol": "GOOGL", "performance": {"return_pct": 50.0}},
+        ]
+
+        stats = tracker.get_signal_stats("AAPL")
+
+        assert stats["pending"] == 1
+        assert stats["avg_return"] == 2.0
+        assert stats["win_rate"] == 50.0
+        assert stats["best_return"] == 6.0
+        assert stats["worst_return"] == -2.0
+        assert type(stats["best_return"]) is float
+        json.dumps(stats)
+
     def test_calculates_avg_return_and_win_rate(self, tmp_path):
         """Should calculate average return and win rate."""
         data_file = tmp_path / "signals.json"
@@ -315,6 +380,42 @@ class TestGetSignalStats:
         assert stats["evaluated"] == 1
         assert stats["pending"] == 2
 
+    def test_symbol_stats_follow_replaced_history(self, tmp_path):
+        """Per-symbol stats should reflect a signal_history list that was replaced wholesale."""
+        data_file = tmp_path / "signals.json"
+        tracker = SignalTracker(data_file=str(data_file))
+
+        tracker.record_alert("AAPL", {"price": 100.0})
+        assert tracker.get_signal_stats("AAPL")["total_signals"] == 1
+
+        tracker.data["signal_history"] = [{"symbol": "MSFT", "performance": {"return_pct": 1.0}}]
+
+        assert tracker.get_signal_stats("AAPL")["total_signals"] == 0
+        assert tracker.get_signal_stats("MSFT")["evaluated"] == 1
+
+    def test_counters_follow_new_alerts_and_evaluations(self, tmp_path):
+        """Stats served from running counters should track record_alert and performance updates."""
+        data_file = tmp_path / "signals.json"
+        tracker = SignalTracker(data_file=str(data_file))
+
+        assert tracker.get_signal_stats()["total_signals"] == 0
+
+        tracker.record_alert("AAPL", {"price": 100.0})
+        stats = tracker.get_signal_stats()
+        assert stats["total_signals"] == 1
+        assert stats["pending"] == 1
+
+        signal_day = datetime.now() - timedelta(days=10)
+        tracker.data["signal_history"][0]["date"] = signal_day.isoformat()
+        dates = pd.date_range(signal_day.date(), periods=10, freq="D")
+        df = pd.DataFrame({"Date": dates, "Close": [100.0] + [110.0] * 9})
+        tracker.update_signal_performance("AAPL", days_after=5, df=df)
+
+        stats = tracker.get_signal_stats()
+        assert stats["evaluated"] == 1
+        assert stats["avg_return"] == 10.0
+        assert stats["win_rate"] == 100.0
+
 
 class TestUpdateSignalPerformance:
     """Tests for update_signal_performance method."""
@@ -334,7 +435,7 @@ class TestUpdateSignalPerformance:
             }
         ]
 
-        with patch("src.data_source_yfinance.daily_ohlc") as mock_ohlc:
+        with patch("src.signal_tracker.daily_ohlc") as mock_ohlc:
             tracker.update_signal_performance("AAPL")
             mock_ohlc.assert_not_called()
 
@@ -346,7 +447,7 @@ class TestUpdateSignalPerformance:
         recent_date = (datetime.now() - timedelta(days=2)).isoformat()
         tracker.data["signal_history"] = [{"symbol": "AAPL", "date": recent_date, "data": {"price": 150.0}}]
 
-        with patch("src.data_source_yfinance.daily_ohlc") as mock_ohlc:
+        with patch("src.signal_tracker.daily_ohlc") as mock_ohlc:
             tracker.update_signal_performance("AAPL", days_after=5)
             mock_ohlc.assert_not_called()
 
@@ -359,7 +460,7 @@ class TestUpdateSignalPerformance:
         tracker.data["signal_history"] = [{"symbol": "AAPL", "date": old_date, "data": {"price": 100.0}}]
 
         # Mock daily_ohlc to verify it's called
-        with patch("src.data_source_yfinance.daily_ohlc") as mock_ohlc:
+        with patch("src.signal_tracker.daily_ohlc") as mock_ohlc:
             mock_ohlc.return_value = None  # Simulate no data
             tracker.update_signal_performance("AAPL", days_after=5)
             # Should have tried to fetch data
@@ -373,13 +474,65 @@ class TestUpdateSignalPerformance:
         old_date = (datetime.now() - timedelta(days=10)).isoformat()
         tracker.data["signal_history"] = [{"symbol": "AAPL", "date": old_date, "data": {"price": 100.0}}]
 
-        with patch("src.data_source_yfinance.daily_ohlc", return_value=None):
+        with patch("src.signal_tracker.daily_ohlc", return_value=None):
             # Should not raise
             tracker.update_signal_performance("AAPL", days_after=5)
 
         # Signal should remain without performance
         assert "performance" not in tracker.data["signal_history"][0]
 
+    def test_uses_prefetched_ohlc(self, tmp_path):
+        """Should evaluate from a prefetched daily_ohlc-shaped frame without fetching."""
+        data_file = tmp_path / "signals.json"
+        tracker = SignalTracker(data_file=str(data_file))
+
+        signal_day = datetime.now() - timedelta(days=20)
+        tracker.data["signal_history"] = [{"symbol": "AAPL", "date": signal_day.isoformat(), "data": {"price": 100.0}}]
+        dates = pd.date_range(signal_day.date(), periods=20, freq="D")
+        df = pd.DataFrame({"Date": dates, "Close": [100.0 + i for i in range(20)]})
+
+        with patch("src.signal_tracker.daily_ohlc") as mock_ohlc:
+            tracker.update_signal_performance("AAPL", days_after=5, df=df)
+            mock_ohlc.assert_not_called()
+
+        performance = tracker.data["signal_history"][0]["performance"]
+        assert performance["exit_price"] == 105.0
+        assert performance["return_pct"] == 5.0
+
+    def test_fetches_once_for_all_pending_signals(self, tmp_path):
+        """Should fetch one frame covering the oldest pending signal and evaluate every signal from it."""
+        data_file = tmp_path / "signals.json"
+        tracker = SignalTracker(data_file=str(data_file))
+
+        now = datetime.now()
+        first_day = now - timedelta(days=30)
+        tracker.data["signal_history"] = [
+            {"symbol": "AAPL", "date": first_day.isoformat(), "data": {"price": 100.0}},
+            {"symbol": "AAPL", "date": (now - timedelta(days=10)).isoformat(), "data": {"price": 100.0}},
+        ]
+        dates = pd.date_range(first_day.date(), periods=31, freq="D")
+        df = pd.DataFrame({"Date": dates, "Close": [100.0 + i for i in range(31)]})
+
+        with patch("src.signal_tracker.daily_ohlc", return_value=df) as mock_ohlc:
+            tracker.update_signal_performance("AAPL", days_after=5)
+
+        mock_ohlc.assert_called_once_with("AAPL", days=40)
+        assert [s["performance"]["exit_price"] for s in tracker.data["signal_history"]] == [105.0, 125.0]
+
+    def test_leaves_signal_pending_when_target_after_last_bar(self, tmp_path):
+        """Should not evaluate a signal whose target date is past the last available bar."""
+        data_file = tmp_path / "signals.json"
+        tracker = SignalTracker(data_file=str(data_file))
+
+        signal_day = datetime.now() - timedelta(days=10)
+        tracker.data["signal_history"] = [{"symbol": "AAPL", "date": signal_day.isoformat(), "data": {"price": 100.0}}]
+        dates = pd.date_range(signal_day.date(), periods=5, freq="D")
+        df = pd.DataFrame({"Date": dates, "Close": [100.0] * 5})
+
+        tracker.update_signal_performance("AAPL", days_after=5, df=df)
+
+        assert "performance" not in tracker.data["signal_history"][0]
+
 
 class TestSaveDataErrorHandling:
     """Tests for _save_data error handling."""
@@ -395,6 +548,57 @@ class TestSaveDataErrorHandling:
         # Data should still be in memory
         assert len(tracker.data["signal_history"]) == 1
 
+    def test_writes_atomically_without_leftover_temp_file(self, tmp_path):
+        """Should replace the data file in one step and leave no temp file behind."""
+        data_file = tmp_path / "signals.json"
+        tracker = SignalTracker(data_file=str(data_file))
+
+        tracker.record_alert("AAPL", {"price": 150.0})
+
+        assert json.loads(data_file.read_text())["signal_history"][0]["symbol"] == "AAPL"
+        assert not (tmp_path / "signals.json.tmp").exists()
+
+
+class TestDeferredSave:
+    """Tests for deferred_save / flush batching."""
+
+    def test_writes_once_on_exit(self, tmp_path):
+        """Saves inside the block should be batched into one write on exit."""
+        data_file = tmp_path / "signals.json"
+        tracker = SignalTracker(data_file=str(data_file))
+
+        with patch.object(tracker, "_save_data") as mock_save:
+            with tracker.deferred_save():
+                tracker.record_alert("AAPL", {"price": 150.0})
+                tracker.record_alert("MSFT", {"price": 300.0})
+                mock_save.assert_not_called()
+
+            mock_save.assert_called_once()
+
+    def test_no_write_when_nothing_changed(self, tmp_path):
+        """Leaving the block without changes should not touch the file."""
+        data_file = tmp_path / "signals.json"
+        tracker = SignalTracker(data_file=str(data_file))
+
+        with tracker.deferred_save():
+            pass
+
+        assert not data_file.exists()
+
+    def test_flushes_when_block_raises(self, tmp_path):
+        """Pending changes should still be written if the block raises."""
+        data_file = tmp_path / "signals.json"
+        tracker = SignalTracker(data_file=str(data_file))
+
+        try:
+            with tracker.deferred_save():
+                tracker.record_alert("AAPL", {"price": 150.0})
+                raise RuntimeError("boom")
+        except RuntimeError:
+            pass
+
+        assert json.loads(data_file.read_text())["signal_history"][0]["symbol"] == "AAPL"
+
 
 class TestEdgeCases:
     """Tests for edge cases and boundary conditions."""
@@ -413,12 +617,27 @@ class TestEdgeCases:
             }
         ]
 
-        with patch("src.data_source_yfinance.daily_ohlc") as mock_ohlc:
+        with patch("src.signal_tracker.daily_ohlc") as mock_ohlc:
             mock_ohlc.return_value = pd.DataFrame({"Close": [100.0]})
             tracker.update_signal_performance("AAPL", days_after=5)
             # Should not update performance because price is 0
             assert "performance" not in tracker.data["signal_history"][0]
 
+    def test_zero_price_and_stale_signals_flagged_without_fetch(self, tmp_path):
+        """Signals that can never be evaluated should be flagged once and not widen the price fetch."""
+        tracker = SignalTracker(data_file=str(tmp_path / "signals.json"))
+        tracker.data["signal_history"] = [
+            {"symbol": "AAPL", "date": (datetime.now() - timedelta(days=10)).isoformat(), "data": {"price": 0}},
+            {"symbol": "AAPL", "date": (datetime.now() - timedelta(days=400)).isoformat(), "data": {"price": 9.0}},
+        ]
+
+        with patch("src.signal_tracker.daily_ohlc") as mock_ohlc:
+            tracker.update_signal_performance("AAPL", days_after=5)
+            tracker.update_signal_performance("AAPL", days_after=5)
+
+        mock_ohlc.assert_not_called()
+        assert [s["unevaluable"] for s in tracker.data["signal_history"]] == ["no_entry_price", "too_old"]
+
     def test_multiple_alerts_same_day(self, tmp_path):
         """Should handle multiple alerts on same day."""
         data_file = tmp_path / "signals.json"
@@ -527,7 +746,7 @@ class TestSignalPerformanceTimestampComparison:
             index=pd.DatetimeIndex([signal_date + timedelta(days=i) for i in range(7)]),
         )
 
-        with patch("src.data_source_yfinance.daily_ohlc", return_value=mock_df):
+        with patch("src.signal_tracker.daily_ohlc", return_value=mock_df):
             # This should NOT raise: '>=' not supported between 'numpy.ndarray' and 'Timestamp'
             tracker.update_signal_performance("TEST", days_after=5)
 
@@ -561,7 +780,7 @@ class TestSignalPerformanceTimestampComparison:
             index=dates,
         )
 
-        with patch("src.data_source_yfinance.daily_ohlc", return_value=mock_df):
+        with patch("src.signal_tracker.daily_ohlc", return_value=mock_df):
             # Should not raise TypeError
             tracker.update_signal_performance("TEST", days_after=5)
 
@@ -589,7 +808,7 @@ class TestSignalPerformanceTimestampComparison:
             index=dates,
         )
 
-        with patch("src.data_source_yfinance.daily_ohlc", return_value=mock_df):
+        with patch("src.signal_tracker.daily_ohlc", return_value=mock_df):
             # Should handle timezone conversion gracefully
             tracker.update_signal_performance("TEST", days_after=5)
 
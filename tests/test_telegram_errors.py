@@ -4,6 +4,7 @@ Tests for Telegram client error handling and retry logic.
 Uses `responses` library for HTTP mocking - deterministic and fast.
 """
 
+import json
 from unittest.mock import patch
 
 import pytest
@@ -55,6 +56,22 @@ class TestTelegramSendSuccess:
 
         assert telegram_client._consecutive_failures == 0
 
+    @responses.activate
+    def test_send_posts_json_body(self, telegram_client):
+        """Should post a JSON body with chat_id, parse_mode and text."""
+        responses.add(
+            responses.POST,
+            "https://api.telegram.org/bottest_bot_token/sendMessage",
+            json={"ok": True, "result": {}},
+            status=200,
+        )
+
+        telegram_client.send('Quote "this" ✅', parse_mode="HTML")
+
+        request = responses.calls[0].request
+        assert request.headers["Content-Type"] == "application/json"
+        assert json.loads(request.body) == {"chat_id": "123456789", "parse_mode": "HTML", "text": 'Quote "this" ✅'}
+
 
 class TestTelegramSendFailure:
     """Tests for message send failures."""
@@ -210,3 +227,17 @@ class TestTelegramHealthCheck:
         """Test health check returns False at failure threshold."""
         telegram_client._consecutive_failures = 5
         assert telegram_client.is_healthy() is False
+
+
+class TestTelegramSession:
+    """Tests for the shared HTTP session."""
+
+    def test_session_shared_across_clients(self, telegram_client):
+        """All clients should reuse one keep-alive session."""
+        other = TelegramClient(token="other_token", chat_id="1")
+
+        session = telegram_client._get_session()
+
+        assert other._get_session() is session
+        assert session.headers["Connection"] == "keep-alive"
+        assert session.get_adapter("https://api.telegram.org")._pool_maxsize == 16